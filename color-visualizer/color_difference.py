@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Color Difference (CIEDE2000)
+Vectorized sRGB -> CIELAB conversion and ΔE2000 on NumPy arrays, plus
+threshold clustering of large color catalogs using Lab-space grid buckets
+so only colors in cells within a proven ΔE2000 bound are ever compared.
+"""
+
+import itertools
+import numpy as np
+
+# Largest SL weight (at L = 0 or 100) and the share of the ΔE2000 sum that the
+# RT cross term can cancel, for bounding the per-channel search radius
+SL_MAX = 1 + 0.015 * 50 ** 2 / np.sqrt(20 + 50 ** 2)
+CROSS_TERM_FACTOR = np.sqrt(1 - np.sin(np.radians(60)))
+
+# D65 reference white
+WHITE_D65 = np.array([0.95047, 1.0, 1.08883])
+
+SRGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+
+def srgb_to_lab(rgb):
+    """Convert sRGB (0-255, shape (..., 3)) to CIELAB D65"""
+    c = np.asarray(rgb, dtype=np.float64) / 255
+    linear = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ SRGB_TO_XYZ.T / WHITE_D65
+
+    eps = 216 / 24389
+    kappa = 24389 / 27
+    f = np.where(xyz > eps, np.cbrt(xyz), (kappa * xyz + 16) / 116)
+
+    L = 116 * f[..., 1] - 16
+    a = 500 * (f[..., 0] - f[..., 1])
+    b = 200 * (f[..., 1] - f[..., 2])
+    return np.stack([L, a, b], axis=-1)
+
+def chroma_scale(C):
+    """1 + G: the factor CIEDE2000 stretches a* by at mean chroma C"""
+    C7 = C ** 7
+    return 1.5 - 0.5 * np.sqrt(C7 / (C7 + 25 ** 7))
+
+def rotation_weight(C):
+    """RC: how strongly CIEDE2000 rotates blue hue differences at mean chroma C"""
+    C7 = C ** 7
+    return 2 * np.sqrt(C7 / (C7 + 25 ** 7))
+
+def lightness_weight(L):
+    """SL at mean lightness L"""
+    return 1 + 0.015 * (L - 50) ** 2 / np.sqrt(20 + (L - 50) ** 2)
+
+def delta_e_2000(lab1, lab2):
+    """CIEDE2000 color difference between broadcastable Lab arrays (..., 3)"""
+    lab1 = np.asarray(lab1, dtype=np.float64)
+    lab2 = np.asarray(lab2, dtype=np.float64)
+    L1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    L2, a2, b2 = lab2[..., 0], lab2[..., 1], lab2[..., 2]
+
+    # Chroma-dependent a* rescaling
+    scale = chroma_scale((np.hypot(a1, b1) + np.hypot(a2, b2)) / 2)
+    a1p = scale * a1
+    a2p = scale * a2
+    C1p = np.hypot(a1p, b1)
+    C2p = np.hypot(a2p, b2)
+    h1p = np.degrees(np.arctan2(b1, a1p)) % 360
+    h2p = np.degrees(np.arctan2(b2, a2p)) % 360
+
+    # Differences
+    dLp = L2 - L1
+    dCp = C2p - C1p
+    chroma_product = C1p * C2p
+    dhp = h2p - h1p
+    dhp = np.where(dhp > 180, dhp - 360, dhp)
+    dhp = np.where(dhp < -180, dhp + 360, dhp)
+    dhp = np.where(chroma_product == 0, 0, dhp)
+    dHp = 2 * np.sqrt(chroma_product) * np.sin(np.radians(dhp) / 2)
+
+    # Means
+    Lp_mean = (L1 + L2) / 2
+    Cp_mean = (C1p + C2p) / 2
+    hp_sum = h1p + h2p
+    hp_mean = np.where(np.abs(h1p - h2p) > 180,
+                       np.where(hp_sum < 360, hp_sum + 360, hp_sum - 360),
+                       hp_sum) / 2
+    hp_mean = np.where(chroma_product == 0, hp_sum, hp_mean)
+
+    # Weighting functions
+    T = (1
+         - 0.17 * np.cos(np.radians(hp_mean - 30))
+         + 0.24 * np.cos(np.radians(2 * hp_mean))
+         + 0.32 * np.cos(np.radians(3 * hp_mean + 6))
+         - 0.20 * np.cos(np.radians(4 * hp_mean - 63)))
+    SL = lightness_weight(Lp_mean)
+    SC = 1 + 0.045 * Cp_mean
+    SH = 1 + 0.015 * Cp_mean * T
+
+    RC = rotation_weight(Cp_mean)
+    d_theta = 30 * np.exp(-(((hp_mean - 275) / 25) ** 2))
+    RT = -np.sin(np.radians(2 * d_theta)) * RC
+
+    return np.sqrt(
+        (dLp / SL) ** 2 + (dCp / SC) ** 2 + (dHp / SH) ** 2
+        + RT * (dCp / SC) * (dHp / SH)
+    )
+
+def search_radii(lab, threshold):
+    """Bounds on |ΔL| and on the a*b* distance for pairs closer than threshold ΔE2000
+
+    For ΔE2000 < threshold:
+    - |ΔL| < threshold * SL, and SL is largest at L = 0 or 100.
+    - ΔC'² + ΔH'² is the squared distance of the pair in the (a', b') plane,
+      at least Δa² + Δb² since both a* are stretched by the same 1 + G >= 1.
+      SH <= SC (T < 3), and the RT cross term removes at most |RT| / 2 of
+      (ΔC'/SC)² + (ΔH'/SH)², so that distance is below
+      threshold * SC / sqrt(1 - |RT| / 2).
+    - SC = 1 + 0.045 C'mean grows with chroma: C'mean <= (1 + G) Cmax, and G
+      is at most G(Cmax / 2) because the mean chroma is at least half of Cmax.
+    - |RT| = RC(C'mean) sin(2 Δθ), where Δθ peaks at a mean hue of 275°. The
+      radius for the worst case |RT| = 2 sin 60° limits how far apart the two
+      hues can be, which bounds how close to 275° their mean hue gets.
+
+    The a*b* radius is per color, valid for pairs where it has the higher chroma.
+    """
+    a, b = lab[:, 1], lab[:, 2]
+    chroma = np.hypot(a, b)
+    scale = chroma_scale(chroma / 2)
+    chroma_p = scale * chroma
+    sc = 1 + 0.045 * chroma_p
+    radius = threshold * sc / CROSS_TERM_FACTOR
+
+    # Mean hue range: h' lies between the hue of (a, b) and of (scale * a, b),
+    # and the other color is within asin(radius / C) of it
+    hue = np.degrees(np.arctan2(b, a))
+    stretch = (np.degrees(np.arctan2(b, scale * a)) - hue + 180) % 360 - 180
+    spread = np.degrees(np.arcsin(np.clip(radius / np.maximum(chroma, 1e-12), 0, 1)))
+    half_width = np.abs(stretch) / 2 + spread / 2
+    to_blue = np.abs((hue + stretch / 2 - 275 + 180) % 360 - 180) - half_width
+    to_blue = np.where(radius < chroma, np.maximum(to_blue, 0), 0)
+
+    rt = rotation_weight(chroma_p) * np.sin(np.radians(60 * np.exp(-(to_blue / 25) ** 2)))
+    return threshold * SL_MAX, threshold * sc / np.sqrt(1 - rt / 2)
+
+def candidate_pairs(lab, threshold, cell):
+    """Yield chunks of index pairs (i < j) that may be closer than threshold ΔE2000
+
+    Colors are bucketed on a Lab grid of cell-sized cubes, and every color
+    looks up the cells within its search radii, so every close pair is found
+    (from its higher-chroma color). Chunks are produced per grid offset and
+    may repeat pairs.
+    """
+    # A little slack so rounding never drops a pair right at the bound
+    threshold = threshold * (1 + 1e-9)
+    l_radius, ab_radius = search_radii(lab, threshold)
+    l_reach = int(np.ceil(l_radius / cell))
+    ab_reach = np.ceil(ab_radius / cell).astype(np.int64)
+    pad = max(l_reach, int(ab_reach.max()))
+
+    # One integer code per cell, padded so neighbor offsets never wrap around
+    keys = np.floor(lab / cell).astype(np.int64)
+    keys -= keys.min(axis=0) - pad
+    dims = keys.max(axis=0) + pad + 1
+    codes = (keys[:, 0] * dims[1] + keys[:, 1]) * dims[2] + keys[:, 2]
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+
+    ab_offsets = range(-pad, pad + 1)
+    for dL, da, db in itertools.product(range(-l_reach, l_reach + 1), ab_offsets, ab_offsets):
+        active = np.nonzero(ab_reach >= max(abs(da), abs(db)))[0]
+        if len(active) == 0:
+            continue
+        target = codes[active] + (dL * dims[1] + da) * dims[2] + db
+        lo = np.searchsorted(sorted_codes, target, side='left')
+        counts = np.searchsorted(sorted_codes, target, side='right') - lo
+        total = counts.sum()
+        if total == 0:
+            continue
+
+        # Expand every (color, cell range) into one pair per cell member
+        i = np.repeat(active, counts)
+        j = order[np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(total)]
+
+        # Cells are coarser than the bounds: check them per pair (SL exactly, from the mean L)
+        l_gap = np.abs(lab[i, 0] - lab[j, 0])
+        keep = ((i != j)
+                & (l_gap < threshold * lightness_weight((lab[i, 0] + lab[j, 0]) / 2))
+                & (np.hypot(lab[i, 1] - lab[j, 1], lab[i, 2] - lab[j, 2]) < ab_radius[i]))
+        yield np.minimum(i, j)[keep], np.maximum(i, j)[keep]
+
+def cluster_colors(rgb, threshold=2.0, cell_factor=2.0):
+    """Group colors closer than threshold ΔE2000 to a representative
+
+    Colors are visited in order; each unassigned color becomes a representative
+    and claims every unassigned color within threshold of it. Candidates come
+    from the Lab grid (cells of threshold * cell_factor), whose search radii
+    bound ΔE2000, so the result is the same as comparing all pairs; the cell
+    size only trades lookups against ΔE2000 evaluations.
+
+    Returns (representatives, labels): representative indices, and for every
+    color the index of its representative.
+    """
+    rgb = np.asarray(rgb, dtype=np.float64).reshape(-1, 3)
+    labels = np.full(len(rgb), -1, dtype=np.int64)
+    if len(rgb) == 0:
+        return [], labels
+
+    lab = srgb_to_lab(rgb)
+    pairs = [np.empty(0, dtype=np.int64)]
+    for i, j in candidate_pairs(lab, threshold, threshold * cell_factor):
+        close = delta_e_2000(lab[i], lab[j]) < threshold
+        pairs.append(i[close] * len(rgb) + j[close])
+    pairs = np.unique(np.concatenate(pairs))
+    first, second = pairs // len(rgb), pairs % len(rgb)
+
+    # Adjacency list of close pairs, ordered by the lower index
+    order = np.argsort(first, kind='stable')
+    first, second = first[order], second[order]
+    starts = np.searchsorted(first, np.arange(len(rgb) + 1))
+
+    representatives = []
+    for index in range(len(rgb)):
+        if labels[index] >= 0:
+            continue
+        representatives.append(index)
+        labels[index] = index
+        neighbors = second[starts[index]:starts[index + 1]]
+        neighbors = neighbors[labels[neighbors] < 0]
+        labels[neighbors] = index
+
+    return representatives, labels
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Color Picker Fields
+Renders a picker-style saturation x lightness plane at a hue and a full hue
+ring, with a marker at the input color. Every pixel is computed at once with
+NumPy, and the fields are cached per hue and size.
+"""
+
+import argparse
+from functools import lru_cache
+import numpy as np
+from PIL import Image, ImageDraw
+from color_management import add_profile_arguments, check_profile_arguments, save_image, working_color
+
+def hsl_to_rgb_array(h, s, l):
+    """Convert broadcastable HSL arrays (0-1) to an RGB uint8 array (..., 3)"""
+    h, s, l = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (h, s, l)))
+    q = np.where(l < 0.5, l * (1 + s), l + s - l * s)
+    p = 2 * l - q
+
+    def hue_to_rgb(t):
+        t = t % 1.0
+        return np.select(
+            [t < 1/6, t < 1/2, t < 2/3],
+            [p + (q - p) * 6 * t, q, p + (q - p) * (2/3 - t) * 6],
+            default=p
+        )
+
+    rgb = np.stack([hue_to_rgb(h + 1/3), hue_to_rgb(h), hue_to_rgb(h - 1/3)], axis=-1)
+    return (rgb * 255).astype(np.uint8)
+
+@lru_cache(maxsize=32)
+def saturation_lightness_field(hue, width, height=None):
+    """Saturation (left -> right) x lightness (bottom -> top) plane at a hue"""
+    height = height or width
+    s = np.linspace(0, 1, width)[np.newaxis, :]
+    l = np.linspace(1, 0, height)[:, np.newaxis]
+    return Image.fromarray(hsl_to_rgb_array(hue, s, l), 'RGB')
+
+@lru_cache(maxsize=8)
+def hue_ring(size, thickness=0.18):
+    """Fully saturated hue ring (0° at the top, clockwise) on a transparent background"""
+    center = (size - 1) / 2
+    y, x = np.mgrid[0:size, 0:size] - center
+    radius = np.hypot(x, y)
+    hue = (np.arctan2(x, -y) / (2 * np.pi)) % 1.0
+
+    outer = size / 2
+    inner = outer * (1 - thickness)
+    # One pixel of soft edge on both sides of the ring
+    alpha = np.clip(outer - radius, 0, 1) * np.clip(radius - inner, 0, 1)
+
+    rgba = np.empty((size, size, 4), dtype=np.uint8)
+    rgba[..., :3] = hsl_to_rgb_array(hue, 1.0, 0.5)
+    rgba[..., 3] = (alpha * 255).astype(np.uint8)
+    return Image.fromarray(rgba, 'RGBA')
+
+def marker_outline(radius):
+    """Stroke width of the marker's rings"""
+    return max(1, round(radius / 4))
+
+def draw_marker(img, center, radius):
+    """Draw a picker marker (white ring with a dark outline) at center"""
+    draw = ImageDraw.Draw(img)
+    x, y = center
+    width = marker_outline(radius)
+    draw.ellipse([x - radius - width, y - radius - width, x + radius + width, y + radius + width],
+                 outline=(0, 0, 0), width=width)
+    draw.ellipse([x - radius, y - radius, x + radius, y + radius], outline=(255, 255, 255), width=width)
+
+def field_with_marker(h, s, l, width, height=None):
+    """Saturation x lightness plane at hue h with the marker at (s, l)"""
+    height = height or width
+    img = saturation_lightness_field(h, width, height).copy()
+    radius = max(4, width // 40)
+    # Keep the whole marker inside the field for colors on its edges (s = 1, l = 0 or 1)
+    inset = radius + marker_outline(radius)
+    x = min(max(s * (width - 1), inset), width - 1 - inset)
+    y = min(max((1 - l) * (height - 1), inset), height - 1 - inset)
+    draw_marker(img, (x, y), radius)
+    return img
+
+def ring_with_marker(h, size, thickness=0.18):
+    """Hue ring with the marker at hue h"""
+    img = hue_ring(size, thickness).copy()
+    radius = size / 2 * (1 - thickness / 2)
+    angle = h * 2 * np.pi
+    center = ((size - 1) / 2 + radius * np.sin(angle), (size - 1) / 2 - radius * np.cos(angle))
+    draw_marker(img, center, max(4, round(size * thickness / 6)))
+    return img
+
+def generate_color_fields(hex_color, field_path, ring_path, size=512, profile=None, source_profile='srgb',
+                          intent='perceptual'):
+    """Save the saturation x lightness field and the hue ring for a color"""
+    # Imported here: generate_color_image imports this module for the card's fields
+    from generate_color_image import hex_to_rgb, rgb_to_hsl
+
+    h, s, l = rgb_to_hsl(*working_color(hex_to_rgb(hex_color), profile, source_profile, intent))
+
+    save_image(field_with_marker(h, s, l, size), field_path, profile)
+    print(f"Saturation/lightness field saved to: {field_path}")
+
+    ring = ring_with_marker(h, size)
+    # Flatten onto white so the PNG is a plain RGB image like the field
+    flat = Image.new('RGB', ring.size, (255, 255, 255))
+    flat.paste(ring, mask=ring.getchannel('A'))
+    save_image(flat, ring_path, profile)
+    print(f"Hue ring saved to: {ring_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the saturation x lightness field and hue ring")
+    parser.add_argument('hex_color')
+    parser.add_argument('field_path')
+    parser.add_argument('ring_path')
+    parser.add_argument('--size', type=int, default=512, help="image size in pixels (default: 512)")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    check_profile_arguments(parser, args)
+
+    generate_color_fields(args.hex_color, args.field_path, args.ring_path, args.size,
+                          args.profile, args.source_profile, args.intent)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Color Management Helpers
+Renders in wide-gamut or other ICC profiles (e.g. Display P3): the input
+color is converted (and gamut mapped) from its profile into the output
+profile, the spectra are then computed directly in that profile's RGB space,
+so they span its full gamut, and the PNG is saved with the profile embedded.
+
+Transforms are built once per (source, target, intent) and cached, and are
+always applied to whole image buffers.
+"""
+
+import os
+from functools import lru_cache
+from PIL import Image, ImageCms
+
+# Profiles that ship with macOS; Pillow can only synthesize sRGB itself
+PROFILE_PATHS = {
+    'display-p3': [
+        "/System/Library/ColorSync/Profiles/Display P3.icc",
+        "/Library/ColorSync/Profiles/Display P3.icc",
+    ],
+    'adobe-rgb': [
+        "/System/Library/ColorSync/Profiles/AdobeRGB1998.icc",
+        "/Library/ColorSync/Profiles/AdobeRGB1998.icc",
+    ],
+}
+
+INTENTS = {
+    'perceptual': ImageCms.Intent.PERCEPTUAL,
+    'relative': ImageCms.Intent.RELATIVE_COLORIMETRIC,
+    'saturation': ImageCms.Intent.SATURATION,
+    'absolute': ImageCms.Intent.ABSOLUTE_COLORIMETRIC,
+}
+
+def normalize_profile_name(name):
+    """Normalize a profile name ('Display P3' -> 'display-p3'); paths are left alone"""
+    if os.path.sep in name or name.lower().endswith(('.icc', '.icm')):
+        return name
+    return name.strip().lower().replace(' ', '-').replace('_', '-')
+
+def load_profile(name):
+    """Load an ICC profile by name ('srgb', 'display-p3', 'adobe-rgb') or file path"""
+    return _load_profile(normalize_profile_name(name))
+
+@lru_cache(maxsize=None)
+def _load_profile(name):
+    if name == 'srgb':
+        return ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB'))
+
+    for path in PROFILE_PATHS.get(name, [name]):
+        if os.path.isfile(path):
+            try:
+                return ImageCms.getOpenProfile(path)
+            except (OSError, ImageCms.PyCMSError) as e:
+                raise ValueError(f"Cannot read ICC profile {path}: {e}") from e
+
+    raise ValueError(f"ICC profile not found: {name} (pass the path to an .icc file)")
+
+def get_transform(source, target, intent='perceptual'):
+    """Build (once) the RGB -> RGB transform from source to target profile"""
+    return _get_transform(normalize_profile_name(source), normalize_profile_name(target), intent)
+
+@lru_cache(maxsize=None)
+def _get_transform(source, target, intent):
+    if intent not in INTENTS:
+        raise ValueError(f"Unknown rendering intent: {intent}")
+    return ImageCms.buildTransform(
+        load_profile(source), load_profile(target), 'RGB', 'RGB',
+        renderingIntent=INTENTS[intent]
+    )
+
+def convert_image(img, profile, source='srgb', intent='perceptual'):
+    """Convert a whole RGB image from the source profile into profile"""
+    if normalize_profile_name(source) == normalize_profile_name(profile):
+        return img
+    return ImageCms.applyTransform(img, get_transform(source, profile, intent))
+
+def convert_colors(colors, profile, source='srgb', intent='perceptual'):
+    """Convert a list of RGB tuples from the source profile into profile as one buffer"""
+    img = Image.new('RGB', (len(colors), 1))
+    img.putdata([tuple(c) for c in colors])
+    data = convert_image(img, profile, source, intent).tobytes()
+    return [tuple(data[i:i + 3]) for i in range(0, len(data), 3)]
+
+def working_color(rgb, profile=None, source='srgb', intent='perceptual'):
+    """The input color in the RGB space the image is rendered in (profile, or sRGB when untagged)"""
+    return convert_colors([rgb], profile or 'srgb', source, intent)[0]
+
+def save_image(img, output_path, profile=None):
+    """Save a PNG rendered in profile's RGB space, tagged with profile when one is given"""
+    if profile is None:
+        img.save(output_path, 'PNG')
+        return
+
+    img.save(output_path, 'PNG', icc_profile=load_profile(profile).tobytes())
+
+def check_profile_arguments(parser, args):
+    """Load the requested profiles up front, reporting missing ones as usage errors"""
+    for name in (args.profile, getattr(args, 'source_profile', None)):
+        if name:
+            try:
+                load_profile(name)
+            except ValueError as e:
+                parser.error(str(e))
+
+def add_profile_arguments(parser, input_color=True):
+    """Add the --profile (and for an input color --source-profile/--intent) options to a parser"""
+    parser.add_argument('--profile', help="output ICC profile: srgb, display-p3, adobe-rgb or an .icc path")
+    if input_color:
+        parser.add_argument('--source-profile', default='srgb',
+                            help="profile the input color is defined in (default: srgb)")
+        parser.add_argument('--intent', default='perceptual', choices=sorted(INTENTS),
+                            help="rendering intent used to map the input color into the output gamut")
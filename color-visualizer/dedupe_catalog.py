@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Color Catalog Deduplication
+Collapses near-identical catalog colors (ΔE2000 below a threshold) into
+cluster representatives, reports the clusters and optionally renders only
+the representatives with the generators.
+"""
+
+import argparse
+import os
+
+from color_difference import cluster_colors
+from generate_color_image import hex_to_rgb
+from watch_palette import GENERATORS, find_palette_files, load_manifest, read_palette, sync
+
+def dedupe(colors, threshold=2.0, cell_factor=2.0):
+    """Map each representative hex color to the catalog colors it stands for"""
+    if not colors:
+        return {}
+    representatives, labels = cluster_colors([hex_to_rgb(c) for c in colors], threshold, cell_factor)
+    clusters = {colors[index]: [] for index in representatives}
+    for color, label in zip(colors, labels):
+        clusters[colors[label]].append(color)
+    return clusters
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collapse near-duplicate colors in catalogs")
+    parser.add_argument('paths', nargs='+', help="catalog files or directories (palette format)")
+    parser.add_argument('-t', '--threshold', type=float, default=2.0, help="ΔE2000 threshold (default: 2.0)")
+    parser.add_argument('--cell-factor', type=float, default=2.0,
+                        help="Lab grid cell size as a multiple of the threshold (speed only, default: 2)")
+    parser.add_argument('-o', '--output', help="write the representatives as a palette file")
+    parser.add_argument('--report', action='store_true', help="list the members of every cluster")
+    parser.add_argument('--render', metavar='DIR', help="render the representatives into DIR")
+    parser.add_argument('-g', '--generator', action='append', choices=sorted(GENERATORS),
+                        help="generator used with --render (repeatable, default: image)")
+    args = parser.parse_args(argv)
+
+    colors = []
+    for path in find_palette_files(args.paths):
+        colors.extend(read_palette(path))
+    colors = list(dict.fromkeys(colors))
+
+    clusters = dedupe(colors, args.threshold, args.cell_factor)
+    print(f"{len(colors)} colors -> {len(clusters)} representatives (ΔE2000 < {args.threshold:g})")
+
+    if args.report:
+        for representative, members in clusters.items():
+            if len(members) > 1:
+                others = ', '.join(m for m in members if m != representative)
+                print(f"{representative} ({len(members)}): {others}")
+
+    palette_path = args.output
+    if args.render and not palette_path:
+        os.makedirs(args.render, exist_ok=True)
+        palette_path = os.path.join(args.render, 'representatives.txt')
+
+    if palette_path:
+        with open(palette_path, 'w', encoding='utf-8') as f:
+            f.write(''.join(f"{color}\n" for color in clusters))
+        print(f"Representatives saved to: {palette_path}")
+
+    if args.render:
+        os.makedirs(args.render, exist_ok=True)
+        sync([palette_path], args.render, args.generator or ['image'], load_manifest(args.render))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Poster Color Chart Generator
+Renders a reference chart of every hue at several saturation and lightness
+steps, sized for print (e.g. 20,000 x 20,000 px at 300 dpi).
+
+The chart is never held in memory: it is rendered in horizontal strips on
+worker processes, each strip is deflate-compressed by its worker, and the
+strips are streamed in order into a single PNG file. Peak memory depends on
+the strip size and worker count, not on the chart height.
+"""
+
+import argparse
+import os
+import struct
+import zlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from PIL import Image, ImageDraw
+from color_fields import hsl_to_rgb_array
+from color_management import add_profile_arguments, check_profile_arguments, load_profile
+from layout import load_font
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+ADLER_BASE = 65521
+
+# Target size of one strip's pixel buffer
+STRIP_BYTES = 16 * 1024 * 1024
+
+Chart = namedtuple('Chart', 'width height colors label_colors labels row_tops col_lefts cell background '
+                            'label_size profile')
+
+def build_chart(hues=36, saturations=4, lightness=9, cell=120, gutter=12, margin=None, labels=False,
+                profile=None):
+    """Compute chart geometry and the color of every cell (rows: saturation blocks x lightness)
+
+    Cell colors are RGB values in the output profile's space, so with a
+    wide-gamut profile the chart spans that profile's full gamut.
+    """
+    margin = gutter * 4 if margin is None else margin
+    block_gap = gutter * 3
+    pitch = cell + gutter
+
+    # Hue across, lightness (light -> dark) down, one block per saturation (high -> low)
+    h = np.arange(hues) / hues
+    s = np.arange(saturations, 0, -1) / saturations
+    l = np.arange(lightness, 0, -1) / (lightness + 1)
+    rows = saturations * lightness
+    row_s = np.repeat(s, lightness)[:, np.newaxis]
+    row_l = np.tile(l, saturations)[:, np.newaxis]
+    colors = hsl_to_rgb_array(h[np.newaxis, :], row_s, row_l)
+
+    luminance = colors.astype(np.float64) @ np.array([0.299, 0.587, 0.114]) / 255
+    label_colors = np.where(luminance[..., np.newaxis] > 0.5, 0, 255).astype(np.uint8).repeat(3, axis=-1)
+
+    row_tops = margin + np.arange(rows) * pitch + (np.arange(rows) // lightness) * block_gap
+    col_lefts = margin + np.arange(hues) * pitch
+    width = int(col_lefts[-1]) + cell + margin
+    height = int(row_tops[-1]) + cell + margin
+
+    return Chart(width, height, colors, label_colors, labels, row_tops, col_lefts, cell, (255, 255, 255),
+                 max(8, cell // 9), profile)
+
+def cell_index(positions, starts, cell):
+    """Cell index of each pixel position, or -1 in gutters and margins"""
+    index = np.searchsorted(starts, positions, side='right') - 1
+    inside = (index >= 0) & (positions - starts[np.maximum(index, 0)] < cell)
+    return np.where(inside, index, -1)
+
+def render_rows(chart, y0, y1):
+    """Render chart rows y0..y1 as an RGB array"""
+    rows = cell_index(np.arange(y0, y1), chart.row_tops, chart.cell)
+    cols = cell_index(np.arange(chart.width), chart.col_lefts, chart.cell)
+
+    # Index -1 (gutters) picks the background row/column appended to the color table
+    table = np.empty((chart.colors.shape[0] + 1, chart.colors.shape[1] + 1, 3), dtype=np.uint8)
+    table[:] = chart.background
+    table[:-1, :-1] = chart.colors
+    strip = table[rows[:, np.newaxis], cols[np.newaxis, :]]
+
+    if not chart.labels:
+        return strip
+
+    # Labels are drawn in chart coordinates shifted by y0, so text crossing a strip edge is split cleanly
+    img = Image.fromarray(strip)
+    draw = ImageDraw.Draw(img)
+    font = load_font('Courier', chart.label_size)
+    visible = np.nonzero((chart.row_tops < y1) & (chart.row_tops + chart.cell > y0))[0]
+    for row in visible:
+        y = chart.row_tops[row] + chart.cell - chart.label_size - y0
+        for col, x in enumerate(chart.col_lefts):
+            r, g, b = chart.colors[row, col]
+            draw.text((x + chart.cell // 2, y), f"#{r:02X}{g:02X}{b:02X}",
+                      fill=tuple(int(v) for v in chart.label_colors[row, col]), font=font, anchor='mm')
+    return np.asarray(img)
+
+def render_strip(chart, y0, y1, level=6):
+    """Render and deflate one strip; returns (raw deflate bytes, adler32, raw length)"""
+    strip = render_rows(chart, y0, y1)
+
+    # Filter type 0 (None) byte in front of every scanline
+    raw = np.empty((y1 - y0, 1 + chart.width * 3), dtype=np.uint8)
+    raw[:, 0] = 0
+    raw[:, 1:] = strip.reshape(y1 - y0, -1)
+    raw = raw.tobytes()
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(raw) + compressor.flush(zlib.Z_SYNC_FLUSH), zlib.adler32(raw), len(raw)
+
+def adler32_combine(adler1, adler2, length2):
+    """Checksum of two concatenated buffers from their checksums (zlib's adler32_combine)"""
+    rem = length2 % ADLER_BASE
+    sum1 = adler1 & 0xFFFF
+    sum2 = (rem * sum1) % ADLER_BASE
+    sum1 += (adler2 & 0xFFFF) + ADLER_BASE - 1
+    sum2 += ((adler1 >> 16) & 0xFFFF) + ((adler2 >> 16) & 0xFFFF) + ADLER_BASE - rem
+    return (sum1 % ADLER_BASE) | ((sum2 % ADLER_BASE) << 16)
+
+def write_chunk(f, kind, data):
+    f.write(struct.pack('>I', len(data)))
+    f.write(kind)
+    f.write(data)
+    f.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(kind))))
+
+def strip_ranges(chart, strip_height):
+    return [(y, min(y + strip_height, chart.height)) for y in range(0, chart.height, strip_height)]
+
+def generate_color_chart(output_path, chart, dpi=300, workers=None, strip_height=None):
+    """Stream the chart into a PNG file, strip by strip"""
+    strip_height = strip_height or max(1, STRIP_BYTES // (chart.width * 3))
+    ranges = strip_ranges(chart, strip_height)
+    workers = workers or os.cpu_count() or 1
+
+    with open(output_path, 'wb') as f:
+        f.write(PNG_SIGNATURE)
+        write_chunk(f, b'IHDR', struct.pack('>IIBBBBB', chart.width, chart.height, 8, 2, 0, 0, 0))
+        if chart.profile:
+            icc = load_profile(chart.profile).tobytes()
+            write_chunk(f, b'iCCP', b'ICC Profile\x00\x00' + zlib.compress(icc))
+        pixels_per_meter = round(dpi / 0.0254)
+        write_chunk(f, b'pHYs', struct.pack('>IIB', pixels_per_meter, pixels_per_meter, 1))
+
+        # zlib header, then the workers' deflate blocks in order
+        checksum = zlib.adler32(b'')
+        write_chunk(f, b'IDAT', b'\x78\x9c')
+
+        def consume(result):
+            nonlocal checksum
+            data, adler, length = result
+            checksum = adler32_combine(checksum, adler, length)
+            if data:
+                write_chunk(f, b'IDAT', data)
+
+        if workers == 1:
+            for y0, y1 in ranges:
+                consume(render_strip(chart, y0, y1))
+        else:
+            # Keep at most two strips per worker in flight so memory stays bounded
+            with ProcessPoolExecutor(workers) as pool:
+                pending = []
+                for y0, y1 in ranges:
+                    pending.append(pool.submit(render_strip, chart, y0, y1))
+                    if len(pending) >= workers * 2:
+                        consume(pending.pop(0).result())
+                for future in pending:
+                    consume(future.result())
+
+        final_block = zlib.compressobj(6, zlib.DEFLATED, -15).flush()
+        write_chunk(f, b'IDAT', final_block + struct.pack('>I', checksum))
+        write_chunk(f, b'IEND', b'')
+
+    print(f"Color chart ({chart.width}x{chart.height}) saved to: {output_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a poster-size color reference chart")
+    parser.add_argument('output_path')
+    parser.add_argument('--hues', type=int, default=36, help="hue columns (default: 36)")
+    parser.add_argument('--saturations', type=int, default=4, help="saturation blocks (default: 4)")
+    parser.add_argument('--lightness', type=int, default=9, help="lightness rows per block (default: 9)")
+    parser.add_argument('--cell', type=int, default=120, help="cell size in pixels (default: 120)")
+    parser.add_argument('--gutter', type=int, default=12, help="space between cells in pixels (default: 12)")
+    parser.add_argument('--labels', action='store_true', help="print the hex code in every cell")
+    parser.add_argument('--dpi', type=int, default=300, help="print resolution stored in the PNG (default: 300)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--strip-height', type=int, help="rows per strip (default: ~16 MB of pixels)")
+    add_profile_arguments(parser, input_color=False)
+    args = parser.parse_args()
+    check_profile_arguments(parser, args)
+
+    chart = build_chart(args.hues, args.saturations, args.lightness, args.cell, args.gutter,
+                        labels=args.labels, profile=args.profile)
+    generate_color_chart(args.output_path, chart, args.dpi, args.workers, args.strip_height)
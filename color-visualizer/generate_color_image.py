@@ -4,8 +4,14 @@ Color Spectrum Image Generator
 Creates a PNG image showing color information and spectrum variations
 """
 
-import sys
-from PIL import Image, ImageDraw, ImageFont
+import argparse
+from functools import lru_cache
+from color_management import add_profile_arguments, check_profile_arguments, working_color
+from color_fields import field_with_marker, ring_with_marker
+from layout import is_vector_output, Bitmap, Card, Font, Rect, Text, add_scale_argument, check_scale_arguments, save_card, strip
+
+# Bump whenever the rendered output changes so cached renders are redone
+LAYOUT_VERSION = 4
 
 def hex_to_rgb(hex_color):
     """Convert hex color to RGB tuple"""
@@ -97,173 +103,165 @@ def generate_palette_colors(h, s, l):
 
     return palettes
 
-def generate_color_image(hex_color, output_path):
-    """Create a PNG image showing color spectrum"""
-
-    r, g, b = hex_to_rgb(hex_color)
-    h, s, l = rgb_to_hsl(r, g, b)
+TEXT_COLOR = (51, 51, 51)
+LABEL_COLOR = (136, 136, 136)
+WHITE = (255, 255, 255)
 
-    # Image dimensions
-    width = 1200
-    height = 1300
+TITLE_FONT = Font('Helvetica', 48)
+HEADING_FONT = Font('Helvetica', 32)
+VALUE_FONT = Font('Courier', 24)
+LABEL_FONT = Font('Helvetica', 18)
+SMALL_FONT = Font('Courier', 14)
 
-    # Create image
-    img = Image.new('RGB', (width, height), color=(248, 249, 250))
-    draw = ImageDraw.Draw(img)
+PALETTE_NAMES = ['Complementary', 'Analogous', 'Triadic', 'Split Complementary', 'Monochromatic']
+PALETTE_SIZES = [2, 3, 3, 3, 3]
+HUE_STEPS = 24
+SATURATION_STEPS = 11
 
-    # Try to use a nice font, fallback to default
-    try:
-        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 48)
-        heading_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 32)
-        text_font = ImageFont.truetype("/System/Library/Fonts/Courier.ttc", 24)
-        label_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 18)
-    except:
-        title_font = heading_font = text_font = label_font = ImageFont.load_default()
+@lru_cache(maxsize=None)
+def color_card_layout():
+    """Layout of the color card, computed once and shared by every color"""
+    width = 1200
+    height = 1640
+    nodes = []
 
     # Title
-    title = "Color Spectrum Visualizer"
-    draw.text((width//2, 40), title, fill=(51, 51, 51), font=title_font, anchor="mm")
+    nodes.append(Text((width // 2, 40), "Color Spectrum Visualizer", TEXT_COLOR, TITLE_FONT, 'mm'))
 
     # Main color swatch
     swatch_size = 250
     swatch_x = 100
     swatch_y = 120
-    draw.rounded_rectangle(
-        [(swatch_x, swatch_y), (swatch_x + swatch_size, swatch_y + swatch_size)],
-        radius=20,
-        fill=(r, g, b),
-        outline=(255, 255, 255),
-        width=4
-    )
+    nodes.append(Rect((swatch_x, swatch_y, swatch_x + swatch_size, swatch_y + swatch_size),
+                      'base', WHITE, 4, 20))
 
     # Color information
     info_x = swatch_x + swatch_size + 80
     info_y = swatch_y + 20
+    nodes.append(Text((info_x, info_y), "{hex}", TEXT_COLOR, HEADING_FONT))
 
-    draw.text((info_x, info_y), hex_color, fill=(51, 51, 51), font=heading_font)
-
-    # Color values
     values = [
-        ("RGB", f"rgb({r}, {g}, {b})"),
-        ("HSL", f"hsl({int(h*360)}°, {int(s*100)}%, {int(l*100)}%)"),
-        ("HEX", hex_color),
+        ("RGB", "rgb({r}, {g}, {b})"),
+        ("HSL", "hsl({h_deg}°, {s_pct}%, {l_pct}%)"),
+        ("HEX", "{hex}"),
     ]
 
     y_offset = info_y + 60
     for label, value in values:
-        # Background box
         box_y = y_offset - 5
-        draw.rounded_rectangle(
-            [(info_x, box_y), (info_x + 450, box_y + 50)],
-            radius=8,
-            fill=(255, 255, 255),
-            outline=(230, 230, 230),
-            width=2
-        )
-
-        draw.text((info_x + 15, y_offset), label, fill=(136, 136, 136), font=label_font)
-        draw.text((info_x + 15, y_offset + 22), value, fill=(51, 51, 51), font=text_font)
+        nodes.append(Rect((info_x, box_y, info_x + 450, box_y + 50), WHITE, (230, 230, 230), 2, 8))
+        nodes.append(Text((info_x + 15, y_offset), label, LABEL_COLOR, LABEL_FONT))
+        nodes.append(Text((info_x + 15, y_offset + 22), value, TEXT_COLOR, VALUE_FONT))
         y_offset += 70
 
-    # Spectrum sections
-    spectrum_y = 420
-
     # Hue Spectrum
-    draw.text((100, spectrum_y), "Hue Spectrum", fill=(51, 51, 51), font=heading_font)
+    spectrum_y = 420
+    nodes.append(Text((100, spectrum_y), "Hue Spectrum", TEXT_COLOR, HEADING_FONT))
     spectrum_y += 50
-    bar_width = (width - 200) // 24
+    bar_width = (width - 200) // HUE_STEPS
     bar_height = 80
-
-    for i in range(24):
-        hue = i / 24
-        rgb = hsl_to_rgb(hue, s, l)
-        x = 100 + i * bar_width
-        draw.rectangle(
-            [(x, spectrum_y), (x + bar_width - 2, spectrum_y + bar_height)],
-            fill=rgb
-        )
-
+    nodes.extend(strip(100, spectrum_y, bar_width, bar_height, HUE_STEPS, 'hue'))
     spectrum_y += bar_height + 40
 
     # Color Palette Recommendations
-    draw.text((100, spectrum_y), "Recommended Color Palettes", fill=(51, 51, 51), font=heading_font)
+    nodes.append(Text((100, spectrum_y), "Recommended Color Palettes", TEXT_COLOR, HEADING_FONT))
     spectrum_y += 50
 
-    palettes = generate_palette_colors(h, s, l)
     palette_box_width = 280
     palette_box_height = 100
 
-    try:
-        small_font = ImageFont.truetype("/System/Library/Fonts/Courier.ttc", 14)
-    except:
-        small_font = ImageFont.load_default()
-
-    palette_names = ['Complementary', 'Analogous', 'Triadic', 'Split Complementary', 'Monochromatic']
-
-    for idx, palette_name in enumerate(palette_names):
+    for idx, palette_name in enumerate(PALETTE_NAMES):
         row = idx // 3
         col = idx % 3
 
         x_pos = 100 + col * (palette_box_width + 60)
         y_pos = spectrum_y + row * (palette_box_height + 90)
+        nodes.append(Text((x_pos, y_pos), palette_name, TEXT_COLOR, LABEL_FONT))
 
-        # Draw palette name
-        draw.text((x_pos, y_pos), palette_name, fill=(51, 51, 51), font=label_font)
+        count = PALETTE_SIZES[idx]
+        swatch_width = palette_box_width // count
+        swatch_bottom = y_pos + 30 + palette_box_height
 
-        # Draw color swatches
-        colors = palettes[palette_name]
-        swatch_width = palette_box_width // len(colors)
-
-        for i, color in enumerate(colors):
+        for i in range(count):
+            key = f"palette_{idx}_{i}"
             swatch_x = x_pos + i * swatch_width
-            draw.rounded_rectangle(
-                [(swatch_x, y_pos + 30), (swatch_x + swatch_width - 4, y_pos + 30 + palette_box_height)],
-                radius=8,
-                fill=color,
-                outline=(255, 255, 255),
-                width=3
-            )
-
-            # Add hex code below each swatch
-            color_hex = f"#{color[0]:02X}{color[1]:02X}{color[2]:02X}"
-            bbox = draw.textbbox((0, 0), color_hex, font=small_font)
-            text_width = bbox[2] - bbox[0]
-            text_x = swatch_x + (swatch_width - text_width) // 2 - 2
-
-            # Draw text with semi-transparent background for readability
-            draw.rectangle(
-                [(swatch_x + 2, y_pos + 30 + palette_box_height - 28),
-                 (swatch_x + swatch_width - 6, y_pos + 30 + palette_box_height - 6)],
-                fill=(0, 0, 0)
-            )
-            draw.text((text_x, y_pos + 30 + palette_box_height - 25), color_hex,
-                     fill=(255, 255, 255), font=small_font)
+            nodes.append(Rect((swatch_x, y_pos + 30, swatch_x + swatch_width - 4, swatch_bottom),
+                              key, WHITE, 3, 8))
+
+            # Hex code on a dark label for readability
+            nodes.append(Rect((swatch_x + 2, swatch_bottom - 28, swatch_x + swatch_width - 6, swatch_bottom - 6),
+                              (0, 0, 0)))
+            nodes.append(Text((swatch_x + swatch_width // 2 - 2, swatch_bottom - 25), f"{{{key}_hex}}",
+                              WHITE, SMALL_FONT, 'ma'))
 
     spectrum_y += (2 * (palette_box_height + 90)) + 40
 
     # Saturation Spectrum
-    draw.text((100, spectrum_y), "Saturation Spectrum", fill=(51, 51, 51), font=heading_font)
+    nodes.append(Text((100, spectrum_y), "Saturation Spectrum", TEXT_COLOR, HEADING_FONT))
     spectrum_y += 50
+    nodes.extend(strip(100, spectrum_y, bar_width * 2, bar_height, SATURATION_STEPS, 'saturation'))
+    spectrum_y += bar_height + 40
 
-    for i in range(11):
-        saturation = i / 10
-        rgb = hsl_to_rgb(h, saturation, l)
-        x = 100 + i * (bar_width * 2)
-        draw.rectangle(
-            [(x, spectrum_y), (x + bar_width * 2 - 2, spectrum_y + bar_height)],
-            fill=rgb
-        )
+    # Picker fields: saturation x lightness plane at the hue, and the hue wheel
+    field_size = 300
+    wheel_x = 100 + field_size + 120
+    nodes.append(Text((100, spectrum_y), "Saturation / Lightness", TEXT_COLOR, HEADING_FONT))
+    nodes.append(Text((wheel_x, spectrum_y), "Hue Wheel", TEXT_COLOR, HEADING_FONT))
+    spectrum_y += 50
+    nodes.append(Bitmap((100, spectrum_y, 100 + field_size, spectrum_y + field_size), 'sl_field'))
+    nodes.append(Bitmap((wheel_x, spectrum_y, wheel_x + field_size, spectrum_y + field_size), 'hue_wheel'))
 
-    # Save image
-    img.save(output_path, 'PNG')
-    print(f"Color spectrum image saved to: {output_path}")
+    return Card(width, height, (248, 249, 250), tuple(nodes))
 
-if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python3 generate_color_image.py <hex_color> <output_path>")
-        sys.exit(1)
+def color_card_context(hex_color, rgb=None):
+    """Colors and values the color card layout refers to"""
+    # rgb is the input color in the output profile's space, when rendering into one
+    r, g, b = rgb or hex_to_rgb(hex_color)
+    h, s, l = rgb_to_hsl(r, g, b)
+
+    context = {
+        'hex': hex_color,
+        'base': (r, g, b),
+        'r': r, 'g': g, 'b': b,
+        'h_deg': int(h * 360), 's_pct': int(s * 100), 'l_pct': int(l * 100),
+    }
 
-    hex_color = sys.argv[1]
-    output_path = sys.argv[2]
+    for i in range(HUE_STEPS):
+        context[f"hue_{i}"] = hsl_to_rgb(i / HUE_STEPS, s, l)
 
-    generate_color_image(hex_color, output_path)
+    palettes = generate_palette_colors(h, s, l)
+    for idx, palette_name in enumerate(PALETTE_NAMES):
+        for i, color in enumerate(palettes[palette_name]):
+            context[f"palette_{idx}_{i}"] = color
+            context[f"palette_{idx}_{i}_hex"] = f"#{color[0]:02X}{color[1]:02X}{color[2]:02X}"
+
+    for i in range(SATURATION_STEPS):
+        context[f"saturation_{i}"] = hsl_to_rgb(h, i / (SATURATION_STEPS - 1), l)
+
+    # Rendered per output scale; the plain fields are cached per hue and size
+    context['sl_field'] = lambda width, height: field_with_marker(h, s, l, width, height)
+    context['hue_wheel'] = lambda width, height: ring_with_marker(h, width)
+
+    return context
+
+def generate_color_image(hex_color, output_path, profile=None, source_profile='srgb', intent='perceptual',
+                         scales=(1,)):
+    """Create a PNG image showing color spectrum (or SVG/HTML, by output extension)"""
+    rgb = working_color(hex_to_rgb(hex_color), profile, source_profile, intent)
+    paths = save_card(color_card_layout(), color_card_context(hex_color, rgb), output_path, scales, profile)
+    for path in paths:
+        print(f"Color spectrum image saved to: {path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a color spectrum image with palettes")
+    parser.add_argument('hex_color')
+    parser.add_argument('output_path')
+    add_profile_arguments(parser)
+    add_scale_argument(parser)
+    args = parser.parse_args()
+    check_profile_arguments(parser, args)
+    if args.profile and is_vector_output(args.output_path):
+        parser.error("--profile only applies to PNG output")
+
+    generate_color_image(args.hex_color, args.output_path, args.profile, args.source_profile, args.intent,
+                         check_scale_arguments(parser, args))
@@ -8,9 +8,14 @@ Generates a visual color spectrum image showing:
 - Saturation spectrum
 """
 
-import sys
-from PIL import Image, ImageDraw, ImageFont
+import argparse
 import colorsys
+from functools import lru_cache
+from color_management import add_profile_arguments, check_profile_arguments, working_color
+from layout import is_vector_output, Card, Font, Rect, Text, add_scale_argument, check_scale_arguments, save_card, strip
+
+# Bump whenever the rendered output changes so cached renders are redone
+LAYOUT_VERSION = 2
 
 def hex_to_rgb(hex_color):
     """Convert hex color to RGB tuple"""
@@ -37,136 +42,126 @@ def get_text_color(bg_r, bg_g, bg_b):
     luminance = (0.299 * bg_r + 0.587 * bg_g + 0.114 * bg_b) / 255
     return (0, 0, 0) if luminance > 0.5 else (255, 255, 255)
 
-def create_spectrum_image(hex_color, output_path):
-    """Create a visual spectrum image"""
+TEXT_COLOR = (51, 51, 51)
 
-    # Parse input color
-    r, g, b = hex_to_rgb(hex_color)
-    h, s, l = rgb_to_hsl(r, g, b)
+TITLE_FONT = Font('Helvetica', 32)
+HEADER_FONT = Font('Helvetica', 24)
+REGULAR_FONT = Font('Helvetica', 16)
+SMALL_FONT = Font('Helvetica', 14)
 
-    # Image dimensions
+HUE_STEPS = 36
+BAR_COUNT = 11
+
+@lru_cache(maxsize=None)
+def spectrum_card_layout():
+    """Layout of the spectrum card, computed once and shared by every color"""
     width = 1000
     height = 900
     margin = 40
-
-    # Create image
-    img = Image.new('RGB', (width, height), (250, 250, 250))
-    draw = ImageDraw.Draw(img)
-
-    # Try to load a font
-    try:
-        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 32)
-        header_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 24)
-        regular_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 16)
-        small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 14)
-    except:
-        title_font = ImageFont.load_default()
-        header_font = ImageFont.load_default()
-        regular_font = ImageFont.load_default()
-        small_font = ImageFont.load_default()
+    nodes = []
 
     y = margin
 
     # Title
-    draw.text((width // 2, y), "COLOR SPECTRUM VISUALIZER", fill=(51, 51, 51),
-              font=title_font, anchor="mt")
+    nodes.append(Text((width // 2, y), "COLOR SPECTRUM VISUALIZER", TEXT_COLOR, TITLE_FONT, 'mt'))
     y += 60
 
     # Main color swatch
     swatch_size = 200
     swatch_x = (width - swatch_size) // 2
-    draw.rectangle([swatch_x, y, swatch_x + swatch_size, y + swatch_size],
-                   fill=(r, g, b), outline=(100, 100, 100), width=3)
+    nodes.append(Rect((swatch_x, y, swatch_x + swatch_size, y + swatch_size), 'base', (100, 100, 100), 3))
 
     # Color info next to swatch
     info_x = swatch_x + swatch_size + 30
     info_y = y + 20
-    text_color = (51, 51, 51)
-
-    draw.text((info_x, info_y), hex_color, fill=text_color, font=header_font)
+    nodes.append(Text((info_x, info_y), "{hex}", TEXT_COLOR, HEADER_FONT))
     info_y += 40
-    draw.text((info_x, info_y), f"RGB: ({r}, {g}, {b})", fill=text_color, font=regular_font)
+    nodes.append(Text((info_x, info_y), "RGB: ({r}, {g}, {b})", TEXT_COLOR, REGULAR_FONT))
     info_y += 30
-    draw.text((info_x, info_y), f"HSL: ({int(h*360)}°, {int(s*100)}%, {int(l*100)}%)",
-              fill=text_color, font=regular_font)
+    nodes.append(Text((info_x, info_y), "HSL: ({h_deg}°, {s_pct}%, {l_pct}%)", TEXT_COLOR, REGULAR_FONT))
 
     y += swatch_size + 50
 
     # Hue Spectrum
-    draw.text((margin, y), "🌈 HUE SPECTRUM (0° - 360°)", fill=(51, 51, 51), font=header_font)
+    nodes.append(Text((margin, y), "🌈 HUE SPECTRUM (0° - 360°)", TEXT_COLOR, HEADER_FONT))
     y += 40
 
-    bar_width = (width - 2 * margin) // 36
+    bar_width = (width - 2 * margin) // HUE_STEPS
     bar_height = 80
-    x = margin
-
-    for i in range(36):
-        hue = i / 36
-        color = hsl_to_rgb(hue, s, l)
-        draw.rectangle([x, y, x + bar_width - 2, y + bar_height], fill=color)
-
-        # Show degree labels for every 60 degrees
-        if i % 6 == 0:
-            degree = int(hue * 360)
-            draw.text((x + bar_width // 2, y + bar_height + 5), f"{degree}°",
-                     fill=(51, 51, 51), font=small_font, anchor="mt")
+    nodes.extend(strip(margin, y, bar_width, bar_height, HUE_STEPS, 'hue'))
 
-        x += bar_width
+    # Show degree labels for every 60 degrees
+    for i in range(0, HUE_STEPS, 6):
+        degree = int(i / HUE_STEPS * 360)
+        x = margin + i * bar_width
+        nodes.append(Text((x + bar_width // 2, y + bar_height + 5), f"{degree}°", TEXT_COLOR, SMALL_FONT, 'mt'))
 
     y += bar_height + 35
 
-    # Lightness Spectrum
-    draw.text((margin, y), "💡 LIGHTNESS SPECTRUM (0% - 100%)", fill=(51, 51, 51), font=header_font)
-    y += 40
-
-    bar_count = 11
-    bar_width = (width - 2 * margin) // bar_count
-    x = margin
+    # Lightness and Saturation Spectrums, labelled with a contrasting text color
+    bar_width = (width - 2 * margin) // BAR_COUNT
+    sections = [
+        ("💡 LIGHTNESS SPECTRUM (0% - 100%)", 'lightness'),
+        ("✨ SATURATION SPECTRUM (0% - 100%)", 'saturation'),
+    ]
 
-    for i in range(bar_count):
-        light = i / (bar_count - 1)
-        color = hsl_to_rgb(h, s, light)
-        draw.rectangle([x, y, x + bar_width - 2, y + bar_height], fill=color)
+    for title, key in sections:
+        nodes.append(Text((margin, y), title, TEXT_COLOR, HEADER_FONT))
+        y += 40
+        nodes.extend(strip(margin, y, bar_width, bar_height, BAR_COUNT, key))
 
-        # Labels
-        pct = int(light * 100)
-        text_col = get_text_color(*color)
-        draw.text((x + bar_width // 2, y + bar_height // 2), f"{pct}%",
-                 fill=text_col, font=small_font, anchor="mm")
+        for i in range(BAR_COUNT):
+            pct = int(i / (BAR_COUNT - 1) * 100)
+            x = margin + i * bar_width
+            nodes.append(Text((x + bar_width // 2, y + bar_height // 2), f"{pct}%",
+                              f"{key}_{i}_text", SMALL_FONT, 'mm'))
 
-        x += bar_width
+        y += bar_height + 30
 
-    y += bar_height + 30
+    return Card(width, height, (250, 250, 250), tuple(nodes))
 
-    # Saturation Spectrum
-    draw.text((margin, y), "✨ SATURATION SPECTRUM (0% - 100%)", fill=(51, 51, 51), font=header_font)
-    y += 40
+def spectrum_card_context(hex_color, rgb=None):
+    """Colors and values the spectrum card layout refers to"""
+    # rgb is the input color in the output profile's space, when rendering into one
+    r, g, b = rgb or hex_to_rgb(hex_color)
+    h, s, l = rgb_to_hsl(r, g, b)
 
-    x = margin
+    context = {
+        'hex': hex_color,
+        'base': (r, g, b),
+        'r': r, 'g': g, 'b': b,
+        'h_deg': int(h * 360), 's_pct': int(s * 100), 'l_pct': int(l * 100),
+    }
 
-    for i in range(bar_count):
-        sat = i / (bar_count - 1)
-        color = hsl_to_rgb(h, sat, l)
-        draw.rectangle([x, y, x + bar_width - 2, y + bar_height], fill=color)
+    for i in range(HUE_STEPS):
+        context[f"hue_{i}"] = hsl_to_rgb(i / HUE_STEPS, s, l)
 
-        # Labels
-        pct = int(sat * 100)
-        text_col = get_text_color(*color)
-        draw.text((x + bar_width // 2, y + bar_height // 2), f"{pct}%",
-                 fill=text_col, font=small_font, anchor="mm")
+    for i in range(BAR_COUNT):
+        value = i / (BAR_COUNT - 1)
+        for key, color in (('lightness', hsl_to_rgb(h, s, value)), ('saturation', hsl_to_rgb(h, value, l))):
+            context[f"{key}_{i}"] = color
+            context[f"{key}_{i}_text"] = get_text_color(*color)
 
-        x += bar_width
+    return context
 
-    # Save image
-    img.save(output_path, 'PNG')
-    print(f"Spectrum image saved to: {output_path}")
+def create_spectrum_image(hex_color, output_path, profile=None, source_profile='srgb', intent='perceptual',
+                          scales=(1,)):
+    """Create a visual spectrum image (or SVG/HTML, by output extension)"""
+    rgb = working_color(hex_to_rgb(hex_color), profile, source_profile, intent)
+    paths = save_card(spectrum_card_layout(), spectrum_card_context(hex_color, rgb), output_path, scales, profile)
+    for path in paths:
+        print(f"Spectrum image saved to: {path}")
 
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python3 generate_color_spectrum.py <hex_color> <output_path>")
-        sys.exit(1)
-
-    hex_color = sys.argv[1]
-    output_path = sys.argv[2]
-
-    create_spectrum_image(hex_color, output_path)
+    parser = argparse.ArgumentParser(description="Generate a simple color spectrum image")
+    parser.add_argument('hex_color')
+    parser.add_argument('output_path')
+    add_profile_arguments(parser)
+    add_scale_argument(parser)
+    args = parser.parse_args()
+    check_profile_arguments(parser, args)
+    if args.profile and is_vector_output(args.output_path):
+        parser.error("--profile only applies to PNG output")
+
+    create_spectrum_image(args.hex_color, args.output_path, args.profile, args.source_profile, args.intent,
+                          check_scale_arguments(parser, args))
@@ -7,6 +7,9 @@ Creates an HTML-based interactive color picker with clickable colors
 import sys
 import colorsys
 
+# Bump whenever the rendered output changes so cached renders are redone
+LAYOUT_VERSION = 1
+
 def hex_to_rgb(hex_color):
     """Convert hex color to RGB tuple"""
     hex_color = hex_color.lstrip('#')
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Declarative Card Layout
+A card is a flat tree of nodes positioned in 1x pixel units. Paints are either
+RGB tuples or keys into a per-color context, and text is a format template
+filled from the same context, so a card layout is computed once per card type
+and reused for every color.
+
+Bitmap nodes embed raster sections (e.g. color fields): their source is a
+context function returning a Pillow image for a pixel size, so each scale is
+rendered natively instead of being resampled.
+
+Backends:
+- Pillow: renders several scale factors (@1x/@2x/@3x) in a single pass
+- SVG and HTML: emit the same tree as vector markup
+"""
+
+import base64
+import html
+import io
+import os
+from collections import namedtuple
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageFont
+from color_management import save_image
+
+Card = namedtuple('Card', 'width height background nodes')
+Rect = namedtuple('Rect', 'box fill outline width radius', defaults=(None, 0, 0))
+Text = namedtuple('Text', 'pos text fill font anchor', defaults=('la',))
+Font = namedtuple('Font', 'family size')
+Bitmap = namedtuple('Bitmap', 'box source')
+
+FONT_FILES = {
+    'Helvetica': "/System/Library/Fonts/Helvetica.ttc",
+    'Courier': "/System/Library/Fonts/Courier.ttc",
+}
+
+VECTOR_EXTENSIONS = ('.svg', '.html', '.htm')
+
+CSS_FONTS = {
+    'Helvetica': "Helvetica, Arial, sans-serif",
+    'Courier': "Courier, 'Courier New', monospace",
+}
+
+# Pillow anchor letters -> SVG / CSS equivalents
+SVG_H_ANCHORS = {'l': 'start', 'm': 'middle', 'r': 'end'}
+SVG_V_ANCHORS = {'a': 'hanging', 't': 'text-before-edge', 'm': 'central',
+                 's': 'alphabetic', 'b': 'text-after-edge', 'd': 'text-after-edge'}
+CSS_H_SHIFT = {'l': '0', 'm': '-50%', 'r': '-100%'}
+CSS_V_SHIFT = {'a': '0', 't': '0', 'm': '-50%', 's': '-100%', 'b': '-100%', 'd': '-100%'}
+
+def strip(x, y, bar_width, bar_height, count, key, gap=2):
+    """Row of count bars filled with context colors key_0 .. key_{count-1}"""
+    return [
+        Rect((x + i * bar_width, y, x + (i + 1) * bar_width - gap, y + bar_height), f"{key}_{i}")
+        for i in range(count)
+    ]
+
+def resolve(card, context):
+    """Bind a layout to one color: look up paint keys and fill in text templates"""
+    def paint(value):
+        return context[value] if isinstance(value, str) else value
+
+    nodes = []
+    for node in card.nodes:
+        if isinstance(node, Rect):
+            nodes.append(node._replace(fill=paint(node.fill), outline=paint(node.outline)))
+        elif isinstance(node, Bitmap):
+            nodes.append(node._replace(source=paint(node.source)))
+        else:
+            nodes.append(node._replace(text=node.text.format(**context), fill=paint(node.fill)))
+    return card._replace(nodes=tuple(nodes))
+
+@lru_cache(maxsize=None)
+def load_font(family, size):
+    """Load a font at a pixel size, falling back to Pillow's default font"""
+    try:
+        return ImageFont.truetype(FONT_FILES[family], size)
+    except (OSError, KeyError):
+        return ImageFont.load_default(size)
+
+def render_pillow(card, scales=(1,)):
+    """Render a resolved card at every scale, drawing each node once per canvas"""
+    canvases = []
+    for scale in scales:
+        img = Image.new('RGB', (round(card.width * scale), round(card.height * scale)), card.background)
+        canvases.append((scale, img, ImageDraw.Draw(img)))
+
+    for node in card.nodes:
+        for scale, img, draw in canvases:
+            if isinstance(node, Rect):
+                box = [round(v * scale) for v in node.box]
+                width = max(1, round(node.width * scale)) if node.outline else 0
+                if node.radius:
+                    draw.rounded_rectangle(box, radius=round(node.radius * scale),
+                                           fill=node.fill, outline=node.outline, width=width)
+                else:
+                    draw.rectangle(box, fill=node.fill, outline=node.outline, width=width)
+            elif isinstance(node, Bitmap):
+                x0, y0, x1, y1 = [round(v * scale) for v in node.box]
+                picture = node.source(x1 - x0, y1 - y0)
+                img.paste(picture, (x0, y0), picture if picture.mode == 'RGBA' else None)
+            else:
+                font = load_font(node.font.family, max(1, round(node.font.size * scale)))
+                pos = (round(node.pos[0] * scale), round(node.pos[1] * scale))
+                draw.text(pos, node.text, fill=node.fill, font=font, anchor=node.anchor)
+
+    return [img for _, img, _ in canvases]
+
+def css_color(rgb):
+    return f"#{rgb[0]:02X}{rgb[1]:02X}{rgb[2]:02X}"
+
+def bitmap_data_uri(node):
+    """PNG data URI of a Bitmap node at its 1x size"""
+    x0, y0, x1, y1 = node.box
+    buffer = io.BytesIO()
+    node.source(x1 - x0, y1 - y0).save(buffer, 'PNG')
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+def render_svg(card):
+    """Render a resolved card as an SVG document"""
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{card.width}" height="{card.height}" '
+        f'viewBox="0 0 {card.width} {card.height}">',
+        f'<rect width="100%" height="100%" fill="{css_color(card.background)}"/>',
+    ]
+    for node in card.nodes:
+        if isinstance(node, Rect):
+            x0, y0, x1, y1 = node.box
+            attrs = f'fill="{css_color(node.fill)}"' if node.fill else 'fill="none"'
+            if node.outline:
+                # Pillow strokes inside the box, SVG centers the stroke on it
+                inset = node.width / 2
+                x0, y0, x1, y1 = x0 + inset, y0 + inset, x1 - inset, y1 - inset
+                attrs += f' stroke="{css_color(node.outline)}" stroke-width="{node.width}"'
+            if node.radius:
+                attrs += f' rx="{node.radius}"'
+            parts.append(f'<rect x="{x0}" y="{y0}" width="{x1 - x0}" height="{y1 - y0}" {attrs}/>')
+        elif isinstance(node, Bitmap):
+            x0, y0, x1, y1 = node.box
+            parts.append(f'<image x="{x0}" y="{y0}" width="{x1 - x0}" height="{y1 - y0}" '
+                         f'href="{bitmap_data_uri(node)}"/>')
+        else:
+            parts.append(
+                f'<text x="{node.pos[0]}" y="{node.pos[1]}" font-family="{CSS_FONTS.get(node.font.family, node.font.family)}" '
+                f'font-size="{node.font.size}" fill="{css_color(node.fill)}" '
+                f'text-anchor="{SVG_H_ANCHORS[node.anchor[0]]}" '
+                f'dominant-baseline="{SVG_V_ANCHORS[node.anchor[1]]}">{html.escape(node.text)}</text>'
+            )
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+def render_html(card, title="Color Card"):
+    """Render a resolved card as absolutely positioned HTML elements"""
+    parts = []
+    for node in card.nodes:
+        if isinstance(node, Rect):
+            x0, y0, x1, y1 = node.box
+            style = f"left:{x0}px;top:{y0}px;width:{x1 - x0}px;height:{y1 - y0}px;"
+            if node.fill:
+                style += f"background:{css_color(node.fill)};"
+            if node.outline:
+                style += f"border:{node.width}px solid {css_color(node.outline)};"
+            if node.radius:
+                style += f"border-radius:{node.radius}px;"
+            parts.append(f'<div style="{style}"></div>')
+        elif isinstance(node, Bitmap):
+            x0, y0, x1, y1 = node.box
+            style = f"left:{x0}px;top:{y0}px;width:{x1 - x0}px;height:{y1 - y0}px;"
+            parts.append(f'<img style="{style}" src="{bitmap_data_uri(node)}" alt="">')
+        else:
+            style = (
+                f"left:{node.pos[0]}px;top:{node.pos[1]}px;"
+                f"font-family:{CSS_FONTS.get(node.font.family, node.font.family)};"
+                f"font-size:{node.font.size}px;color:{css_color(node.fill)};"
+                f"transform:translate({CSS_H_SHIFT[node.anchor[0]]},{CSS_V_SHIFT[node.anchor[1]]});"
+            )
+            parts.append(f'<div class="text" style="{style}">{html.escape(node.text)}</div>')
+
+    body = '\n        '.join(parts)
+    return f'''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>{html.escape(title)}</title>
+    <style>
+        body {{ margin: 0; }}
+        .card {{ position: relative; width: {card.width}px; height: {card.height}px; background: {css_color(card.background)}; }}
+        .card div, .card img {{ position: absolute; box-sizing: border-box; }}
+        .card .text {{ white-space: nowrap; line-height: 1; }}
+    </style>
+</head>
+<body>
+    <div class="card">
+        {body}
+    </div>
+</body>
+</html>'''
+
+def scaled_path(output_path, scale):
+    """output.png -> output@2x.png (scale 1 keeps the original name)"""
+    if scale == 1:
+        return output_path
+    stem, ext = os.path.splitext(output_path)
+    return f"{stem}@{scale:g}x{ext}"
+
+def is_vector_output(output_path):
+    """Whether output_path selects the SVG or HTML backend"""
+    return os.path.splitext(output_path)[1].lower() in VECTOR_EXTENSIONS
+
+def save_card(card, context, output_path, scales=(1,), profile=None):
+    """Render a card for one color; .svg/.html pick the vector backends, anything else PNG per scale"""
+    resolved = resolve(card, context)
+    ext = os.path.splitext(output_path)[1].lower()
+    scales = tuple(dict.fromkeys(scales))
+    if any(scale <= 0 for scale in scales):
+        raise ValueError("scale factors must be positive")
+
+    if is_vector_output(output_path):
+        if profile:
+            raise ValueError("ICC profiles only apply to PNG output")
+        markup = render_svg(resolved) if ext == '.svg' else render_html(resolved, context.get('hex', "Color Card"))
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(markup)
+        return [output_path]
+
+    paths = []
+    for scale, img in zip(scales, render_pillow(resolved, scales)):
+        path = scaled_path(output_path, scale)
+        save_image(img, path, profile)
+        paths.append(path)
+    return paths
+
+def add_scale_argument(parser):
+    """Add the repeatable --scale option to an argparse parser"""
+    parser.add_argument('--scale', type=float, action='append',
+                        help="PNG scale factor, repeatable (e.g. --scale 1 --scale 2 --scale 3)")
+
+def check_scale_arguments(parser, args):
+    """The requested scales without repeats (default 1x), reporting non-positive ones as usage errors"""
+    scales = tuple(dict.fromkeys(args.scale or (1,)))
+    if any(scale <= 0 for scale in scales):
+        parser.error("--scale must be greater than 0")
+    return scales
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from color_difference import candidate_pairs, cluster_colors, delta_e_2000, srgb_to_lab
+
+# Sharma, Wu & Dalal (2005) reference pairs: (Lab 1, Lab 2, ΔE2000)
+SHARMA_PAIRS = [
+    ((50.0, 2.6772, -79.7751), (50.0, 0.0, -82.7485), 2.0425),
+    ((50.0, 3.1571, -77.2803), (50.0, 0.0, -82.7485), 2.8615),
+    ((50.0, -1.3802, -84.2814), (50.0, 0.0, -82.7485), 1.0000),
+    ((50.0, 2.5, 0.0), (50.0, 0.0, -2.5), 4.3065),
+    ((50.0, 2.5, 0.0), (73.0, 25.0, -18.0), 27.1492),
+    ((60.2574, -34.0099, 36.2677), (60.4626, -34.1751, 39.4387), 1.2644),
+    ((22.7233, 20.0904, -46.6940), (23.0331, 14.9730, -42.5619), 2.0373),
+    ((90.9257, -0.5406, -0.9208), (88.6381, -0.8985, -0.7239), 1.5381),
+]
+
+def catalog(seed=0):
+    """Random colors plus dense saturated blues and greens, where ΔE2000 discounts chroma most"""
+    rng = np.random.default_rng(seed)
+    uniform = rng.integers(0, 256, (800, 3))
+    blues = np.stack([rng.integers(0, 90, 400), rng.integers(0, 90, 400), rng.integers(170, 256, 400)], axis=1)
+    greens = np.stack([rng.integers(0, 130, 400), rng.integers(200, 256, 400), rng.integers(0, 130, 400)], axis=1)
+    return np.concatenate([uniform, blues, greens])
+
+def brute_force_pairs(lab, threshold):
+    pairs = set()
+    for i in range(len(lab) - 1):
+        close = np.nonzero(delta_e_2000(lab[i], lab[i + 1:]) < threshold)[0]
+        pairs.update((i, i + 1 + j) for j in close.tolist())
+    return pairs
+
+def brute_force_clusters(lab, threshold):
+    labels = np.full(len(lab), -1)
+    for i in range(len(lab)):
+        if labels[i] < 0:
+            close = np.nonzero(delta_e_2000(lab[i], lab) < threshold)[0]
+            labels[close[labels[close] < 0]] = i
+    return labels
+
+@pytest.mark.parametrize("lab1, lab2, expected", SHARMA_PAIRS)
+def test_delta_e_2000_reference_values(lab1, lab2, expected):
+    assert delta_e_2000(lab1, lab2) == pytest.approx(expected, abs=1e-4)
+    assert delta_e_2000(lab2, lab1) == pytest.approx(expected, abs=1e-4)
+
+def test_saturated_greens_are_compared():
+    rgb = [(0x49, 0xEF, 0x4B), (0x69, 0xED, 0x56)]
+    assert delta_e_2000(*srgb_to_lab(rgb)) < 2.0
+    representatives, labels = cluster_colors(rgb, 2.0)
+    assert representatives == [0]
+    assert labels.tolist() == [0, 0]
+
+@pytest.mark.parametrize("threshold", [1.0, 2.0, 5.0])
+@pytest.mark.parametrize("cell_factor", [1.0, 2.0, 4.0])
+def test_candidates_include_every_close_pair(threshold, cell_factor):
+    lab = srgb_to_lab(catalog())
+    candidates = set()
+    for first, second in candidate_pairs(lab, threshold, threshold * cell_factor):
+        candidates.update(zip(first.tolist(), second.tolist()))
+    assert brute_force_pairs(lab, threshold) <= candidates
+
+@pytest.mark.parametrize("threshold", [1.0, 2.0, 5.0])
+def test_clusters_match_brute_force(threshold):
+    rgb = catalog(seed=1)
+    representatives, labels = cluster_colors(rgb, threshold)
+    expected = brute_force_clusters(srgb_to_lab(rgb), threshold)
+    assert labels.tolist() == expected.tolist()
+    assert representatives == sorted(set(expected.tolist()))
+
+def test_empty_catalog():
+    representatives, labels = cluster_colors([], 2.0)
+    assert representatives == []
+    assert len(labels) == 0
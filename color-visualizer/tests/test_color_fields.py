@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+import color_fields
+from color_fields import field_with_marker, hsl_to_rgb_array, marker_outline, saturation_lightness_field
+
+@pytest.fixture
+def markers(monkeypatch):
+    """Record the (center, radius) of every marker field_with_marker draws"""
+    drawn = []
+    monkeypatch.setattr(color_fields, 'draw_marker', lambda img, center, radius: drawn.append((center, radius)))
+    return drawn
+
+@pytest.mark.parametrize("s, l", [(1.0, 0.5), (0.0, 0.5), (0.5, 1.0), (0.5, 0.0), (1.0, 1.0), (0.0, 0.0)])
+@pytest.mark.parametrize("size", [64, 200, 333])
+def test_marker_is_never_clipped_at_the_edges(markers, s, l, size):
+    field_with_marker(0.95, s, l, size)
+    (x, y), radius = markers[0]
+    extent = radius + marker_outline(radius)
+    assert 0 <= x - extent and x + extent <= size - 1
+    assert 0 <= y - extent and y + extent <= size - 1
+
+def test_marker_follows_the_color_inside_the_field(markers):
+    field_with_marker(0.3, 0.25, 0.75, 201)
+    assert markers[0][0] == (50, 50)
+
+def test_marker_is_drawn_on_a_copy():
+    field = saturation_lightness_field(0.5, 100, 100)
+    before = field.tobytes()
+    marked = field_with_marker(0.5, 0.5, 0.5, 100)
+    assert field.tobytes() == before
+    assert marked.tobytes() != before
+
+def test_hsl_to_rgb_array_primaries():
+    rgb = hsl_to_rgb_array(np.array([0, 1/3, 2/3]), 1.0, 0.5)
+    assert rgb.tolist() == [[255, 0, 0], [0, 255, 0], [0, 0, 255]]
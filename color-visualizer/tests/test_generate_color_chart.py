@@ -0,0 +1,67 @@
+import os
+import struct
+import zlib
+import numpy as np
+import pytest
+from generate_color_chart import PNG_SIGNATURE, adler32_combine, build_chart, generate_color_chart, render_rows
+
+def read_chunks(path):
+    """(type, data) of every PNG chunk, checking each CRC"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    assert data[:8] == PNG_SIGNATURE
+    chunks = []
+    offset = 8
+    while offset < len(data):
+        length, kind = struct.unpack('>I4s', data[offset:offset + 8])
+        body = data[offset + 8:offset + 8 + length]
+        crc, = struct.unpack('>I', data[offset + 8 + length:offset + 12 + length])
+        assert crc == zlib.crc32(body, zlib.crc32(kind))
+        chunks.append((kind, body))
+        offset += 12 + length
+    return chunks
+
+def decode(path):
+    """Pixels of an 8-bit RGB PNG with unfiltered scanlines; zlib checks the Adler-32"""
+    chunks = read_chunks(path)
+    width, height, depth, color_type = struct.unpack('>IIBB', chunks[0][1][:10])
+    assert chunks[0][0] == b'IHDR' and (depth, color_type) == (8, 2)
+    raw = zlib.decompress(b''.join(body for kind, body in chunks if kind == b'IDAT'))
+    rows = np.frombuffer(raw, dtype=np.uint8).reshape(height, 1 + width * 3)
+    assert not rows[:, 0].any()
+    return rows[:, 1:].reshape(height, width, 3)
+
+@pytest.mark.parametrize("sizes", [(0, 0), (1, 0), (0, 1), (1, 1), (5, 70000), (65521, 3), (100000, 65537)])
+def test_adler32_combine(sizes):
+    rng = np.random.default_rng(sum(sizes))
+    first, second = (rng.integers(0, 256, size, dtype=np.uint8).tobytes() for size in sizes)
+    assert adler32_combine(zlib.adler32(first), zlib.adler32(second), len(second)) == zlib.adler32(first + second)
+
+def test_adler32_combine_many_parts():
+    rng = np.random.default_rng(7)
+    parts = [rng.integers(0, 256, size, dtype=np.uint8).tobytes() for size in (17, 0, 4096, 99999, 1)]
+    checksum = zlib.adler32(b'')
+    for part in parts:
+        checksum = adler32_combine(checksum, zlib.adler32(part), len(part))
+    assert checksum == zlib.adler32(b''.join(parts))
+
+@pytest.fixture(scope='module')
+def chart():
+    return build_chart(hues=7, saturations=2, lightness=3, cell=40, gutter=5, labels=True)
+
+@pytest.mark.parametrize("workers, strip_height", [(1, None), (1, 7), (3, 1), (3, 13), (2, 1000)])
+def test_streamed_png_matches_rendered_rows(chart, tmp_path, workers, strip_height):
+    path = os.path.join(tmp_path, "chart.png")
+    generate_color_chart(path, chart, workers=workers, strip_height=strip_height)
+    assert np.array_equal(decode(path), render_rows(chart, 0, chart.height))
+
+def test_png_has_physical_size_and_profile(tmp_path):
+    chart = build_chart(hues=3, saturations=1, lightness=2, cell=10, gutter=2, profile='srgb')
+    path = os.path.join(tmp_path, "chart.png")
+    generate_color_chart(path, chart, dpi=300, workers=1)
+    chunks = dict(read_chunks(path))
+    assert struct.unpack('>IIB', chunks[b'pHYs']) == (11811, 11811, 1)
+    name, _, compressed = chunks[b'iCCP'].partition(b'\x00')
+    assert name == b'ICC Profile' and compressed[0] == 0
+    assert len(zlib.decompress(compressed[1:])) > 0
+    assert [kind for kind, _ in read_chunks(path)][-1] == b'IEND'
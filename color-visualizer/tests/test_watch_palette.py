@@ -0,0 +1,130 @@
+import os
+from types import SimpleNamespace
+import pytest
+import watch_palette
+from watch_palette import MANIFEST_NAME, find_palette_files, load_manifest, sync
+
+class StubGenerator:
+    """Stands in for a generator module: writes the color to the output and records every render"""
+
+    def __init__(self):
+        self.module = SimpleNamespace(LAYOUT_VERSION=1)
+        self.rendered = []
+
+    def render(self, color, output_path):
+        self.rendered.append(color)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(color)
+
+@pytest.fixture
+def stub(monkeypatch):
+    generator = StubGenerator()
+    monkeypatch.setitem(watch_palette.GENERATORS, 'stub', (generator.module, generator.render, '.out'))
+    return generator
+
+def write_palette(path, *colors):
+    path.write_text('\n'.join(colors) + '\n', encoding='utf-8')
+
+def run_sync(palette, output_dir):
+    return sync([str(palette)], str(output_dir), ['stub'], load_manifest(str(output_dir)))
+
+def test_only_added_colors_are_rendered(tmp_path, stub):
+    palette = tmp_path / "brand.txt"
+    write_palette(palette, "#ff0000", "#00f")
+    assert run_sync(palette, tmp_path) == (2, 0)
+
+    write_palette(palette, "#ff0000", "#00f", "#00ff00")
+    assert run_sync(palette, tmp_path) == (1, 0)
+    assert stub.rendered == ["#ff0000", "#0000ff", "#00ff00"]
+
+def test_removed_color_output_is_deleted(tmp_path, stub):
+    palette = tmp_path / "brand.txt"
+    write_palette(palette, "#ff0000", "#00ff00")
+    run_sync(palette, tmp_path)
+    assert (tmp_path / "ff0000-stub.out").exists()
+
+    write_palette(palette, "#00ff00")
+    assert run_sync(palette, tmp_path) == (0, 1)
+    assert not (tmp_path / "ff0000-stub.out").exists()
+    assert (tmp_path / "00ff00-stub.out").exists()
+    assert [entry['color'] for entry in load_manifest(str(tmp_path)).values()] == ["#00ff00"]
+
+def test_missing_output_is_rendered_again(tmp_path, stub):
+    palette = tmp_path / "brand.txt"
+    write_palette(palette, "#ff0000")
+    run_sync(palette, tmp_path)
+    os.remove(tmp_path / "ff0000-stub.out")
+    assert run_sync(palette, tmp_path) == (1, 0)
+
+def test_layout_version_bump_rerenders(tmp_path, stub):
+    palette = tmp_path / "brand.txt"
+    write_palette(palette, "#ff0000", "#00ff00")
+    run_sync(palette, tmp_path)
+
+    stub.module.LAYOUT_VERSION = 2
+    assert run_sync(palette, tmp_path) == (2, 2)
+    assert stub.rendered == ["#ff0000", "#00ff00"] * 2
+    assert (tmp_path / "ff0000-stub.out").exists()
+    assert {entry['layout'] for entry in load_manifest(str(tmp_path)).values()} == {2}
+
+def test_manifest_is_never_read_as_palette(tmp_path, stub):
+    # Renders go next to the palette, so the manifest (full of hex colors) is in the watched directory
+    palette = tmp_path / "brand.json"
+    write_palette(palette, '"#ff0000"', '"#00ff00"')
+    run_sync(tmp_path, tmp_path)
+    assert (tmp_path / MANIFEST_NAME).exists()
+    assert find_palette_files([str(tmp_path)]) == [str(palette)]
+    assert find_palette_files([str(tmp_path / MANIFEST_NAME)]) == []
+
+    write_palette(palette, '"#00ff00"')
+    assert run_sync(tmp_path, tmp_path) == (0, 1)
+    assert not (tmp_path / "ff0000-stub.out").exists()
+
+class ScriptedWake:
+    """threading.Event stand-in: each wait advances a fake clock and runs the next step"""
+
+    def __init__(self, clock, steps):
+        self.clock = clock
+        self.steps = iter(steps)
+
+    def wait(self, timeout):
+        self.clock[0] += timeout
+        step = next(self.steps, None)
+        if step is None:
+            raise KeyboardInterrupt
+        step()
+
+    def set(self):
+        pass
+
+    def clear(self):
+        pass
+
+def test_watch_debounces_bursts_of_saves(tmp_path, stub, monkeypatch):
+    palette = tmp_path / "brand.txt"
+    output_dir = tmp_path / "renders"
+    write_palette(palette, "#ff0000")
+
+    clock = [0.0]
+    steps = [
+        lambda: write_palette(palette, "#ff0000", "#00ff00"),
+        lambda: write_palette(palette, "#ff0000", "#00ff00", "#0000ff"),
+        lambda: None,
+        lambda: None,
+    ]
+    syncs = []
+
+    def counting_sync(*args):
+        syncs.append(list(stub.rendered))
+        return sync(*args)
+
+    monkeypatch.setattr(watch_palette, 'start_observer', lambda paths, wake: None)
+    monkeypatch.setattr(watch_palette, 'threading', SimpleNamespace(Event=lambda: ScriptedWake(clock, steps)))
+    monkeypatch.setattr(watch_palette.time, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(watch_palette, 'sync', counting_sync)
+
+    watch_palette.watch([str(palette)], str(output_dir), ['stub'], interval=1.0, debounce=0.5)
+
+    # The initial sync, then one sync for both saves once they settled
+    assert len(syncs) == 2
+    assert stub.rendered == ["#ff0000", "#00ff00", "#0000ff"]
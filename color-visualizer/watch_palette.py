@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Palette Watch Mode
+Watches palette files and re-renders only the colors that were added or changed.
+
+A palette file is any text file (plain list, JSON, CSS, ...) - every #rrggbb or
+#rgb token in it is a palette entry. Renders are tracked in a manifest stored in
+the output directory, keyed by a hash of (color, generator, layout version).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+import generate_color_image
+import generate_color_spectrum
+import generate_interactive_spectrum
+
+# name -> (module, render function, file extension)
+GENERATORS = {
+    'image': (generate_color_image, generate_color_image.generate_color_image, '.png'),
+    'spectrum': (generate_color_spectrum, generate_color_spectrum.create_spectrum_image, '.png'),
+    'interactive': (generate_interactive_spectrum, generate_interactive_spectrum.generate_interactive_html, '.html'),
+}
+
+PALETTE_SUFFIXES = ('.txt', '.json', '.palette', '.css')
+MANIFEST_NAME = '.palette-manifest.json'
+MANIFEST_VERSION = 1
+
+HEX_TOKEN = re.compile(r'#([0-9a-fA-F]{6}|[0-9a-fA-F]{3})(?![0-9a-fA-F])')
+
+def normalize_hex(token):
+    """Normalize #rgb / #rrggbb to lowercase #rrggbb"""
+    token = token.lstrip('#').lower()
+    if len(token) == 3:
+        token = ''.join(c * 2 for c in token)
+    return '#' + token
+
+def parse_palette(text):
+    """Return the palette colors found in text, in order, without duplicates"""
+    colors = []
+    seen = set()
+    for match in HEX_TOKEN.finditer(text):
+        color = normalize_hex(match.group(0))
+        if color not in seen:
+            seen.add(color)
+            colors.append(color)
+    return colors
+
+def read_palette(path):
+    """Read the palette colors from a file"""
+    with open(path, encoding='utf-8', errors='replace') as f:
+        return parse_palette(f.read())
+
+def is_palette_name(name):
+    """Palette files by suffix; dotfiles (including the render manifest) never are"""
+    return not name.startswith('.') and name.lower().endswith(PALETTE_SUFFIXES)
+
+def find_palette_files(paths):
+    """Expand directories into the palette files they contain"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                full = os.path.join(path, name)
+                if is_palette_name(name) and os.path.isfile(full):
+                    files.append(full)
+        elif os.path.isfile(path) and not os.path.basename(path).startswith('.'):
+            files.append(path)
+    return files
+
+def scan(paths):
+    """Snapshot (mtime, size) of every palette file, used to detect saves"""
+    snapshot = {}
+    for path in find_palette_files(paths):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        snapshot[path] = (st.st_mtime_ns, st.st_size)
+    return snapshot
+
+def entry_key(color, generator):
+    """Content hash of one render: (color, generator, layout version)"""
+    layout_version = GENERATORS[generator][0].LAYOUT_VERSION
+    data = f"{color}\0{generator}\0{layout_version}".encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:16]
+
+def output_name(color, generator):
+    """File name of a render inside the output directory"""
+    return f"{color.lstrip('#')}-{generator}{GENERATORS[generator][2]}"
+
+def load_manifest(output_dir):
+    """Load the render manifest, or an empty one if missing or outdated"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('entries', {})
+
+def save_manifest(output_dir, entries):
+    """Atomically write the render manifest"""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'entries': entries}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def sync(palette_paths, output_dir, generators, entries):
+    """Render added/changed entries and delete orphans, updating entries in place"""
+    colors = []
+    for path in find_palette_files(palette_paths):
+        try:
+            colors.extend(read_palette(path))
+        except OSError as e:
+            print(f"Skipping {path}: {e}")
+    colors = list(dict.fromkeys(colors))
+
+    wanted = {}
+    for color in colors:
+        for generator in generators:
+            wanted[entry_key(color, generator)] = (color, generator)
+
+    # Orphans first: a new layout version reuses the old output file name
+    removed = 0
+    for key in [k for k in entries if k not in wanted]:
+        try:
+            os.remove(os.path.join(output_dir, entries[key]['output']))
+        except FileNotFoundError:
+            pass
+        del entries[key]
+        removed += 1
+
+    rendered = 0
+    for key, (color, generator) in wanted.items():
+        entry = entries.get(key)
+        if entry and os.path.exists(os.path.join(output_dir, entry['output'])):
+            continue
+        name = output_name(color, generator)
+        render = GENERATORS[generator][1]
+        try:
+            render(color, os.path.join(output_dir, name))
+        except Exception as e:
+            print(f"Failed to render {color} with {generator}: {e}")
+            continue
+        entries[key] = {
+            'color': color,
+            'generator': generator,
+            'layout': GENERATORS[generator][0].LAYOUT_VERSION,
+            'output': name,
+        }
+        rendered += 1
+
+    save_manifest(output_dir, entries)
+    print(f"Synced {len(colors)} colors: {rendered} rendered, {removed} removed")
+    return rendered, removed
+
+def start_observer(paths, wake):
+    """Use watchdog (inotify/FSEvents) when installed, otherwise return None to poll"""
+    try:
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+    except ImportError:
+        return None
+
+    class WakeHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            wake.set()
+
+    observer = Observer()
+    handler = WakeHandler()
+    for path in paths:
+        directory = path if os.path.isdir(path) else (os.path.dirname(path) or '.')
+        observer.schedule(handler, directory, recursive=False)
+    observer.start()
+    return observer
+
+def watch(palette_paths, output_dir, generators, interval=0.5, debounce=0.3):
+    """Sync once, then re-sync after palette saves settle for `debounce` seconds"""
+    os.makedirs(output_dir, exist_ok=True)
+    entries = load_manifest(output_dir)
+    snapshot = scan(palette_paths)
+    sync(palette_paths, output_dir, generators, entries)
+
+    wake = threading.Event()
+    observer = start_observer(palette_paths, wake)
+    print(f"Watching {', '.join(palette_paths)} ({'events' if observer else 'polling'}); Ctrl-C to stop")
+
+    changed_at = None
+    try:
+        while True:
+            if changed_at is not None:
+                timeout = max(0.0, changed_at + debounce - time.monotonic())
+            else:
+                timeout = None if observer else interval
+            wake.wait(timeout)
+            wake.clear()
+
+            current = scan(palette_paths)
+            if current != snapshot:
+                snapshot = current
+                changed_at = time.monotonic()
+            elif changed_at is not None and time.monotonic() - changed_at >= debounce:
+                changed_at = None
+                sync(palette_paths, output_dir, generators, entries)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if observer:
+            observer.stop()
+            observer.join()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incrementally render palette files")
+    parser.add_argument('paths', nargs='+', help="palette files or directories")
+    parser.add_argument('-o', '--output', required=True, help="output directory")
+    parser.add_argument('-g', '--generator', action='append', choices=sorted(GENERATORS),
+                        help="generator to run (repeatable, default: image)")
+    parser.add_argument('--once', action='store_true', help="sync once and exit")
+    parser.add_argument('--interval', type=float, default=0.5, help="polling interval in seconds")
+    parser.add_argument('--debounce', type=float, default=0.3, help="quiet time before re-rendering")
+    args = parser.parse_args(argv)
+
+    generators = args.generator or ['image']
+    if args.once:
+        os.makedirs(args.output, exist_ok=True)
+        sync(args.paths, args.output, generators, load_manifest(args.output))
+    else:
+        watch(args.paths, args.output, generators, args.interval, args.debounce)
+
+if __name__ == "__main__":
+    main()
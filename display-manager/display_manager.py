@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Smart Display Resolution Manager (Python engine)
+Parses `displayplacer list` into a display topology, picks a layout from
+profiles.json and only runs displayplacer when the screens differ from it.
+
+Run once (e.g. from a Launch Agent) or as a daemon that polls for hot-plug
+events and waits for the topology to settle before applying anything.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PROFILES = os.path.join(SCRIPT_DIR, "profiles.json")
+
+class Display(NamedTuple):
+    """One screen as reported by `displayplacer list`"""
+    persistent_id: str
+    contextual_id: Optional[str]
+    type: str
+    resolution: Optional[str]
+    hertz: Optional[int]
+    color_depth: Optional[int]
+    scaling: Optional[str]
+    origin: Tuple[int, int]
+    rotation: int
+    enabled: bool
+    main: bool
+
+    @property
+    def builtin(self):
+        return "built in" in self.type.lower()
+
+class Topology(NamedTuple):
+    """All connected screens, in displayplacer's order"""
+    displays: Tuple[Display, ...]
+
+    @property
+    def builtin(self):
+        return next((d for d in self.displays if d.builtin), None)
+
+    @property
+    def externals(self):
+        return tuple(d for d in self.displays if not d.builtin)
+
+    @property
+    def signature(self):
+        """Which screens are connected, ignoring their current modes"""
+        return tuple(sorted(d.persistent_id for d in self.displays))
+
+FIELD_PATTERN = re.compile(r'^([A-Za-z ]+):\s*(.*)$')
+ORIGIN_PATTERN = re.compile(r'\((-?\d+),\s*(-?\d+)\)')
+
+def _leading_int(value):
+    match = re.match(r'-?\d+', value or '')
+    return int(match.group(0)) if match else None
+
+def _make_display(fields):
+    origin = ORIGIN_PATTERN.search(fields.get('origin', ''))
+    return Display(
+        persistent_id=fields['persistent screen id'],
+        contextual_id=fields.get('contextual screen id'),
+        type=fields.get('type', ''),
+        resolution=fields.get('resolution'),
+        hertz=_leading_int(fields.get('hertz')),
+        color_depth=_leading_int(fields.get('color depth')),
+        scaling=fields.get('scaling'),
+        origin=(int(origin.group(1)), int(origin.group(2))) if origin else (0, 0),
+        rotation=_leading_int(fields.get('rotation')) or 0,
+        enabled=fields.get('enabled', 'true').lower() == 'true',
+        main='main display' in fields.get('origin', ''),
+    )
+
+@lru_cache(maxsize=8)
+def parse_displayplacer(output):
+    """Parse `displayplacer list` output into a Topology (cached per output text)"""
+    displays = []
+    fields = None
+    for line in output.splitlines():
+        # Mode listings are indented; the trailing command is not a "Key: value" line
+        if line[:1].isspace():
+            continue
+        match = FIELD_PATTERN.match(line.strip())
+        if not match:
+            continue
+        key, value = match.group(1).strip().lower(), match.group(2).strip()
+        if key == 'persistent screen id':
+            if fields:
+                displays.append(_make_display(fields))
+            fields = {}
+        if fields is not None:
+            fields.setdefault(key, value)
+    if fields:
+        displays.append(_make_display(fields))
+    return Topology(tuple(displays))
+
+def load_profiles(path):
+    """Load the ordered list of layout profiles"""
+    with open(path, encoding='utf-8') as f:
+        try:
+            return json.load(f)['profiles']
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Invalid profiles file {path}: {e}") from e
+
+def profile_matches(profile, topology):
+    """Check a profile's `when` conditions against the connected screens"""
+    when = profile.get('when', {})
+    count = len(topology.externals)
+    if 'externals' in when and count != when['externals']:
+        return False
+    if 'min_externals' in when and count < when['min_externals']:
+        return False
+    if 'max_externals' in when and count > when['max_externals']:
+        return False
+    return True
+
+def display_settings(profile, display, topology):
+    """Settings a profile gives a display: by persistent id, else by role"""
+    settings = profile['displays']
+    if display.persistent_id in settings:
+        return settings[display.persistent_id]
+    if display.builtin:
+        return settings.get('builtin')
+    if topology.externals and display == topology.externals[0]:
+        return settings.get('external')
+    return None
+
+def display_argument(display, settings):
+    """displayplacer argument for one screen"""
+    origin = settings.get('origin', [0, 0])
+    return (
+        f"id:{display.persistent_id} res:{settings['res']} hz:{settings.get('hz', 60)} "
+        f"color_depth:{settings.get('color_depth', 8)} enabled:true scaling:{settings.get('scaling', 'on')} "
+        f"origin:({origin[0]},{origin[1]}) degree:{settings.get('degree', 0)}"
+    )
+
+def display_is_current(display, settings):
+    """Check whether a screen already runs with the given settings"""
+    origin = tuple(settings.get('origin', [0, 0]))
+    return (
+        display.enabled
+        and display.resolution == settings['res']
+        and display.hertz == settings.get('hz', 60)
+        and display.color_depth == settings.get('color_depth', 8)
+        and display.scaling == settings.get('scaling', 'on')
+        and display.origin == origin
+        and display.rotation == settings.get('degree', 0)
+    )
+
+def plan(profiles, topology):
+    """Pick the first matching profile; returns (profile, arguments, already_current)"""
+    if topology.builtin is None:
+        raise RuntimeError("Could not find built-in display")
+
+    for profile in profiles:
+        if not profile_matches(profile, topology):
+            continue
+        arguments = []
+        current = True
+        for display in topology.displays:
+            settings = display_settings(profile, display, topology)
+            if settings:
+                arguments.append(display_argument(display, settings))
+                current = current and display_is_current(display, settings)
+        return profile, tuple(arguments), current
+
+    return None, (), True
+
+class DisplayManager:
+    """Applies profiles through displayplacer, remembering what this session applied"""
+
+    def __init__(self, profiles, displayplacer="displayplacer", dry_run=False, notify=False):
+        self.profiles = profiles
+        self.displayplacer = displayplacer
+        self.dry_run = dry_run
+        self.notify = notify
+        self.last_applied = None
+
+    def read_topology(self):
+        """Run `displayplacer list` and parse it"""
+        result = subprocess.run([self.displayplacer, 'list'], capture_output=True, text=True, check=True)
+        return parse_displayplacer(result.stdout)
+
+    def reconcile(self, topology):
+        """Apply the matching profile unless the displays already run it"""
+        profile, arguments, current = plan(self.profiles, topology)
+        if profile is None:
+            log("No profile matches the connected displays")
+            return None
+        if current:
+            log(f"{profile['name']}: displays already match, nothing to do")
+            self.last_applied = arguments
+            return None
+        if arguments == self.last_applied:
+            # Applied earlier in this session but the screens report other modes; don't loop on it
+            log(f"{profile['name']}: already applied, displays report different modes")
+            return None
+
+        command = [self.displayplacer, *arguments]
+        log(f"{profile['name']}: {' '.join(command)}")
+        # Recorded before running, so a layout displayplacer rejects isn't retried on every poll
+        self.last_applied = arguments
+        if not self.dry_run:
+            subprocess.run(command, check=True)
+            if self.notify:
+                notify(profile['name'])
+        return command
+
+    def run_once(self):
+        return self.reconcile(self.read_topology())
+
+    def run_daemon(self, interval=2.0, debounce=3.0, polls=None):
+        """Poll for topology changes and reconcile once a change has settled (forever unless polls is given)"""
+        seen = None
+        changed_at = None
+        settled = None
+        for _ in itertools.repeat(None) if polls is None else range(polls):
+            try:
+                topology = self.read_topology()
+            except (OSError, subprocess.CalledProcessError) as e:
+                # displayplacer can fail while a screen is being attached
+                log(f"ERROR: {e}")
+                time.sleep(interval)
+                continue
+
+            now = time.monotonic()
+            if topology.signature != seen:
+                seen = topology.signature
+                changed_at = now
+            if seen != settled and now - changed_at >= debounce:
+                try:
+                    self.reconcile(topology)
+                except (OSError, RuntimeError, subprocess.CalledProcessError) as e:
+                    # e.g. no built-in display in clamshell mode, or a mode a screen rejects:
+                    # report once and wait for the screens to change before trying again
+                    log(f"ERROR: {e}")
+                settled = seen
+            time.sleep(interval)
+
+def log(message):
+    print(message, flush=True)
+
+def notify(message):
+    """Show a macOS notification, like the AppleScript version"""
+    if shutil.which('osascript'):
+        script = f'display notification {json.dumps(message)} with title "Display Manager"'
+        subprocess.run(['osascript', '-e', script], check=False)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply display layouts with displayplacer")
+    parser.add_argument('--profiles', default=DEFAULT_PROFILES, help="profiles JSON file")
+    parser.add_argument('--displayplacer', default=os.environ.get('DISPLAYPLACER', 'displayplacer'),
+                        help="displayplacer binary (default: $DISPLAYPLACER or displayplacer)")
+    parser.add_argument('--dry-run', action='store_true', help="print commands without running them")
+    parser.add_argument('--notify', action='store_true', help="show a notification after applying")
+    parser.add_argument('--list', action='store_true', help="print the parsed topology and exit")
+    parser.add_argument('--daemon', action='store_true', help="keep running and react to hot-plug events")
+    parser.add_argument('--interval', type=float, default=2.0, help="daemon polling interval in seconds")
+    parser.add_argument('--debounce', type=float, default=3.0, help="seconds a new topology must be stable")
+    args = parser.parse_args(argv)
+
+    try:
+        manager = DisplayManager(load_profiles(args.profiles), args.displayplacer, args.dry_run, args.notify)
+        if args.list:
+            for display in manager.read_topology().displays:
+                role = "built-in" if display.builtin else "external"
+                log(f"{display.persistent_id} ({role}): {display.resolution} @ {display.hertz}Hz origin {display.origin}")
+        elif args.daemon:
+            manager.run_daemon(args.interval, args.debounce)
+        else:
+            manager.run_once()
+    except KeyboardInterrupt:
+        pass
+    except (OSError, ValueError, RuntimeError, subprocess.CalledProcessError) as e:
+        log(f"ERROR: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import json
+import os
+import shutil
+import subprocess
+import pytest
+import display_manager
+from display_manager import DisplayManager, load_profiles, parse_displayplacer, plan, profile_matches
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(TESTS_DIR, "fixtures")
+FAKE_DISPLAYPLACER = os.path.join(TESTS_DIR, "fake_displayplacer")
+
+BUILTIN_ID = "37D8832A-2D66-02CA-B9F7-8F30A301B230"
+EXTERNAL_ID = "5A8B6C6E-AAAA-BBBB-CCCC-111122223333"
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name + ".txt"), encoding='utf-8') as f:
+        return f.read()
+
+def topology(name):
+    return parse_displayplacer(fixture(name))
+
+@pytest.fixture
+def profiles():
+    return load_profiles(display_manager.DEFAULT_PROFILES)
+
+class FakeDisplayplacer:
+    """Controls what the fake binary lists and reads back the commands it received"""
+
+    def __init__(self, tmp_path, monkeypatch):
+        self.listing = tmp_path / "list.txt"
+        self.log = tmp_path / "commands.log"
+        self.monkeypatch = monkeypatch
+        monkeypatch.setenv('FAKE_DISPLAYPLACER_LIST', str(self.listing))
+        monkeypatch.setenv('FAKE_DISPLAYPLACER_LOG', str(self.log))
+
+    def show(self, name, status=0):
+        shutil.copy(os.path.join(FIXTURES, name + ".txt"), self.listing)
+        self.monkeypatch.setenv('FAKE_DISPLAYPLACER_STATUS', str(status))
+
+    def commands(self):
+        if not self.log.exists():
+            return []
+        return [json.loads(line) for line in self.log.read_text().splitlines()]
+
+    def applied(self):
+        return [command for command in self.commands() if command != ['list']]
+
+@pytest.fixture
+def fake(tmp_path, monkeypatch):
+    return FakeDisplayplacer(tmp_path, monkeypatch)
+
+def test_parse_builtin_only():
+    displays = topology("builtin_only").displays
+    assert len(displays) == 1
+    builtin = displays[0]
+    assert builtin.builtin and builtin.main and builtin.enabled
+    assert builtin.persistent_id == BUILTIN_ID
+    assert (builtin.resolution, builtin.hertz, builtin.color_depth, builtin.scaling) == ("1800x1125", 120, 8, "on")
+    assert builtin.origin == (0, 0)
+    assert builtin.rotation == 0
+
+def test_parse_builtin_and_external():
+    parsed = topology("builtin_external")
+    assert parsed.builtin.persistent_id == BUILTIN_ID
+    assert [d.persistent_id for d in parsed.externals] == [EXTERNAL_ID]
+    external = parsed.externals[0]
+    assert not external.main
+    assert (external.resolution, external.hertz, external.scaling, external.origin) == ("1920x1080", 60, "off", (1800, 0))
+    assert parsed.signature == tuple(sorted([BUILTIN_ID, EXTERNAL_ID]))
+
+def test_parse_two_externals():
+    parsed = topology("two_externals")
+    assert len(parsed.displays) == 3
+    assert [d.resolution for d in parsed.externals] == ["1920x1080", "2560x1440"]
+    assert parsed.externals[1].origin == (3720, 0)
+
+def test_parse_clamshell_has_no_builtin():
+    parsed = topology("clamshell")
+    assert parsed.builtin is None
+    assert len(parsed.externals) == 1
+
+def test_profile_matches(profiles):
+    single, docked = profiles
+    assert profile_matches(single, topology("builtin_only"))
+    assert not profile_matches(docked, topology("builtin_only"))
+    assert not profile_matches(single, topology("builtin_external"))
+    assert profile_matches(docked, topology("builtin_external"))
+    assert profile_matches(docked, topology("two_externals"))
+    assert not profile_matches({'when': {'max_externals': 1}}, topology("two_externals"))
+
+def test_plan_builtin_only_is_current(profiles):
+    profile, arguments, current = plan(profiles, topology("builtin_only"))
+    assert profile['name'] == "Single Display Mode"
+    assert arguments == (
+        f"id:{BUILTIN_ID} res:1800x1125 hz:120 color_depth:8 enabled:true scaling:on origin:(0,0) degree:0",
+    )
+    assert current
+
+def test_plan_external(profiles):
+    profile, arguments, current = plan(profiles, topology("builtin_external"))
+    assert profile['name'] == "External Monitor Connected"
+    assert arguments == (
+        f"id:{BUILTIN_ID} res:1512x982 hz:120 color_depth:8 enabled:true scaling:on origin:(-1512,0) degree:0",
+        f"id:{EXTERNAL_ID} res:1920x1080 hz:60 color_depth:8 enabled:true scaling:on origin:(0,0) degree:0",
+    )
+    assert not current
+
+def test_plan_two_externals_configures_first_external(profiles):
+    profile, arguments, current = plan(profiles, topology("two_externals"))
+    assert profile['name'] == "External Monitor Connected"
+    assert [argument.split()[0] for argument in arguments] == [f"id:{BUILTIN_ID}", f"id:{EXTERNAL_ID}"]
+
+def test_plan_without_builtin_raises(profiles):
+    with pytest.raises(RuntimeError):
+        plan(profiles, topology("clamshell"))
+
+def test_read_topology_failure(profiles, fake):
+    fake.show("list_failure", status=1)
+    manager = DisplayManager(profiles, FAKE_DISPLAYPLACER)
+    with pytest.raises(subprocess.CalledProcessError):
+        manager.read_topology()
+
+def test_reconcile_skips_when_current(profiles, fake):
+    fake.show("builtin_only")
+    assert DisplayManager(profiles, FAKE_DISPLAYPLACER).run_once() is None
+    assert fake.commands() == [['list']]
+
+def test_reconcile_applies_changed_layout(profiles, fake):
+    fake.show("builtin_external")
+    manager = DisplayManager(profiles, FAKE_DISPLAYPLACER)
+    manager.run_once()
+    _, arguments, _ = plan(profiles, topology("builtin_external"))
+    assert fake.applied() == [list(arguments)]
+
+    # The fake doesn't change modes: not re-applied within the session, but on the next run
+    manager.run_once()
+    assert len(fake.applied()) == 1
+    DisplayManager(profiles, FAKE_DISPLAYPLACER).run_once()
+    assert len(fake.applied()) == 2
+
+def test_reconcile_corrects_drifted_mode(profiles, fake):
+    fake.show("builtin_only")
+    fake.listing.write_text(fake.listing.read_text().replace("Resolution: 1800x1125", "Resolution: 1512x982"))
+    DisplayManager(profiles, FAKE_DISPLAYPLACER).run_once()
+    _, arguments, _ = plan(profiles, topology("builtin_only"))
+    assert fake.applied() == [list(arguments)]
+
+def test_dry_run_does_not_apply(profiles, fake):
+    fake.show("builtin_external")
+    command = DisplayManager(profiles, FAKE_DISPLAYPLACER, dry_run=True).run_once()
+    assert command[0] == FAKE_DISPLAYPLACER
+    assert fake.applied() == []
+
+def run_daemon(manager, fake, monkeypatch, sequence, interval=1.0, debounce=2.0):
+    """Run the daemon over one listing per poll, on a fake clock advanced by sleep"""
+    clock = [0.0]
+    listings = iter(sequence[1:])
+
+    def show(listing):
+        fake.show(*(listing if isinstance(listing, tuple) else (listing,)))
+
+    def sleep(seconds):
+        clock[0] += seconds
+        listing = next(listings, None)
+        if listing:
+            show(listing)
+
+    monkeypatch.setattr(display_manager.time, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(display_manager.time, 'sleep', sleep)
+    show(sequence[0])
+    manager.run_daemon(interval, debounce, polls=len(sequence))
+
+def test_daemon_debounces_hotplug_bursts(profiles, fake, monkeypatch):
+    # Dock flapping while being plugged in, then stable
+    sequence = ["builtin_external", "builtin_only", "builtin_external", "builtin_only",
+                "builtin_external", "builtin_external", "builtin_external", "builtin_external"]
+    run_daemon(DisplayManager(profiles, FAKE_DISPLAYPLACER), fake, monkeypatch, sequence)
+    _, arguments, _ = plan(profiles, topology("builtin_external"))
+    assert fake.applied() == [list(arguments)]
+
+def test_daemon_waits_for_debounce(profiles, fake, monkeypatch):
+    sequence = ["builtin_only", "builtin_external", "builtin_external"]
+    run_daemon(DisplayManager(profiles, FAKE_DISPLAYPLACER), fake, monkeypatch, sequence)
+    assert fake.applied() == []
+
+def test_daemon_survives_failing_list(profiles, fake, monkeypatch, capsys):
+    sequence = ["builtin_external", ("list_failure", 1), "builtin_external", "builtin_external",
+                "builtin_external"]
+    run_daemon(DisplayManager(profiles, FAKE_DISPLAYPLACER), fake, monkeypatch, sequence)
+    assert len(fake.applied()) == 1
+    assert capsys.readouterr().out.count("ERROR") == 1
+
+def test_daemon_does_not_retry_failed_apply(profiles, fake, monkeypatch, capsys):
+    monkeypatch.setenv('FAKE_DISPLAYPLACER_APPLY_STATUS', '1')
+    sequence = ["builtin_external"] * 10
+    run_daemon(DisplayManager(profiles, FAKE_DISPLAYPLACER), fake, monkeypatch, sequence)
+    assert len(fake.applied()) == 1
+    assert capsys.readouterr().out.count("ERROR") == 1
+
+def test_daemon_retries_after_topology_change(profiles, fake, monkeypatch):
+    monkeypatch.setenv('FAKE_DISPLAYPLACER_APPLY_STATUS', '1')
+    # builtin_only already matches its profile, so only the two docked periods send a layout
+    sequence = ["builtin_external"] * 4 + ["builtin_only"] * 4 + ["builtin_external"] * 4
+    run_daemon(DisplayManager(profiles, FAKE_DISPLAYPLACER), fake, monkeypatch, sequence)
+    assert len(fake.applied()) == 2
+
+def test_main_reports_invalid_profiles(tmp_path, capsys):
+    path = tmp_path / "profiles.json"
+    path.write_text("{not json")
+    with pytest.raises(SystemExit) as exit_info:
+        display_manager.main(['--profiles', str(path)])
+    assert exit_info.value.code == 1
+    assert "ERROR: Invalid profiles file" in capsys.readouterr().out
+
+def test_main_reports_missing_profiles(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        display_manager.main(['--profiles', str(tmp_path / "missing.json")])
+    assert exit_info.value.code == 1
+    assert "ERROR:" in capsys.readouterr().out
+
+def test_daemon_reports_missing_builtin_once(profiles, fake, monkeypatch, capsys):
+    sequence = ["clamshell"] * 6
+    run_daemon(DisplayManager(profiles, FAKE_DISPLAYPLACER), fake, monkeypatch, sequence)
+    assert fake.applied() == []
+    assert capsys.readouterr().out.count("ERROR") == 1